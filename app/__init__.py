@@ -7,9 +7,28 @@ __version__ = "1.0.0"
 __author__ = "URL Monitor Team"
 __description__ = "Lightweight URL monitoring for free hosting tiers"
 
-# Package imports
-from .config import get_config, Config
-from .database import get_database, DatabaseManager, URLRecord, CheckResult
+# Package imports, resolved on first access so that reading __version__
+# (e.g. `main.py --version`) doesn't load the config and database modules
+_LAZY_IMPORTS = {
+    'get_config': '.config',
+    'Config': '.config',
+    'get_database': '.database',
+    'DatabaseManager': '.database',
+    'URLRecord': '.database',
+    'CheckResult': '.database',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'get_config',
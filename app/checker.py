@@ -5,73 +5,431 @@ Core URL Checking Logic for URL Monitor
 Uses concurrent requests to efficiently check multiple URLs.
 """
 
+import asyncio
 import requests
 import logging
-from time import perf_counter
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Any
+import socket
+import threading
+import time
+from time import perf_counter_ns
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from app.database import URLRecord, get_database
 from app.config import get_config
 
 logger = logging.getLogger(__name__)
 
-def check_single_url(url_record: URLRecord) -> Dict[str, Any]:
+# Checker settings are resolved once at import rather than on every check
+_CONFIG = get_config()
+_HEADERS = {'User-Agent': _CONFIG.get('checker.user_agent', 'URLMonitor/1.0')}
+_VERIFY_SSL = _CONFIG.get('checker.verify_ssl', True)
+_FOLLOW_REDIRECTS = _CONFIG.get('checker.follow_redirects', True)
+_DEFAULT_TIMEOUT = _CONFIG.get('checker.request_timeout', 10)
+_METHOD = _CONFIG.get('checker.method', 'HEAD').upper()
+_BACKEND = _CONFIG.get('checker.backend', 'requests')
+
+# One requests.Session per worker thread, so repeated checks against the
+# same host reuse pooled keep-alive connections instead of new TCP/TLS handshakes.
+_local = threading.local()
+
+# Incremented after every check cycle so readers (e.g. the dashboard) can tell
+# when cached status data is stale.
+_cycle_id = 0
+
+# Servers that reject HEAD answer with one of these; retry those checks with GET.
+_HEAD_FALLBACK_STATUSES = (405, 501)
+
+def get_cycle_id() -> int:
+    """Get the number of check cycles completed by this process."""
+    return _cycle_id
+
+def create_session() -> requests.Session:
+    """
+    Creates an HTTP session configured for URL checks.
+
+    The connection pool is sized to ``checker.concurrent_limit`` so the
+    session can also be shared by every worker thread of a check cycle.
+    """
+    pool_size = _CONFIG.get('checker.concurrent_limit', 10)
+    retries = Retry(
+        total=_CONFIG.get('checker.retry_attempts', 2),
+        backoff_factor=_CONFIG.get('checker.retry_delay', 3)
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(_HEADERS)
+    # requests >= 2.32 verifies against one SSLContext preloaded at import,
+    # so the CA bundle is never re-parsed per request or per session
+    session.verify = _VERIFY_SSL
+    return session
+
+def _get_session() -> requests.Session:
+    """Get the thread-local HTTP session, creating it on first use."""
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = create_session()
+        _local.session = session
+
+    return session
+
+def _fetch_status(session: requests.Session, url: str, method: str,
+                  request_kwargs: Dict[str, Any]) -> int:
+    """Requests a URL and returns its status code without reading the body."""
+    if method == 'HEAD':
+        status_code = session.head(url, **request_kwargs).status_code
+        if status_code not in _HEAD_FALLBACK_STATUSES:
+            return status_code
+
+    # Only the status line is needed: stream the GET and close it unread
+    with session.get(url, stream=True, **request_kwargs) as response:
+        return response.status_code
+
+def _discard_body(data: bytes) -> int:
+    """pycurl write callback: returning 0 aborts the transfer once body bytes arrive."""
+    return 0
+
+def _get_curl():
+    """Get the thread-local pycurl handle, creating it on first use (it keeps connections alive)."""
+    import pycurl
+
+    curl = getattr(_local, 'curl', None)
+    if curl is None:
+        curl = pycurl.Curl()
+        curl.setopt(pycurl.NOSIGNAL, 1)  # required when used from worker threads
+        curl.setopt(pycurl.USERAGENT, _HEADERS['User-Agent'])
+        curl.setopt(pycurl.FOLLOWLOCATION, int(_FOLLOW_REDIRECTS))
+        curl.setopt(pycurl.SSL_VERIFYPEER, int(_VERIFY_SSL))
+        curl.setopt(pycurl.SSL_VERIFYHOST, 2 if _VERIFY_SSL else 0)
+        curl.setopt(pycurl.CONNECTTIMEOUT, _CONFIG.get('checker.connect_timeout', 5))
+        curl.setopt(pycurl.WRITEFUNCTION, _discard_body)
+        _local.curl = curl
+
+    return curl
+
+def _fetch_status_curl(url: str, method: str, timeout: int) -> int:
+    """
+    Requests a URL with libcurl and returns its status code without reading the body.
+
+    libcurl failures are re-raised as the matching requests exceptions so both
+    backends report errors the same way.
+    """
+    import pycurl
+
+    curl = _get_curl()
+    curl.setopt(pycurl.URL, url)
+    curl.setopt(pycurl.TIMEOUT, timeout)
+    try:
+        if method == 'HEAD':
+            curl.setopt(pycurl.NOBODY, 1)
+            curl.perform()
+            status_code = curl.getinfo(pycurl.RESPONSE_CODE)
+            if status_code not in _HEAD_FALLBACK_STATUSES:
+                return status_code
+
+        curl.setopt(pycurl.HTTPGET, 1)
+        try:
+            curl.perform()
+        except pycurl.error as e:
+            # _discard_body aborts the GET as soon as the body starts
+            if e.args[0] != pycurl.E_WRITE_ERROR:
+                raise
+        return curl.getinfo(pycurl.RESPONSE_CODE)
+
+    except pycurl.error as e:
+        if e.args[0] == pycurl.E_OPERATION_TIMEDOUT:
+            raise requests.exceptions.Timeout(e.args[1]) from e
+        raise requests.exceptions.ConnectionError(e.args[1]) from e
+
+def check_single_url(url_record: URLRecord,
+                     session: Optional[requests.Session] = None) -> Dict[str, Any]:
     """
     Checks a single URL and returns a result dictionary.
 
     Args:
         url_record: The URLRecord object from the database.
+        session: Session to send the request with; defaults to the
+            thread-local one. Ignored by the pycurl backend.
 
     Returns:
         A dictionary containing the check results.
     """
-    config = get_config()
-    result = {
+    timeout = url_record.timeout or _DEFAULT_TIMEOUT
+    status_code = error_message = None
+
+    start_ns = perf_counter_ns()
+    try:
+        if _BACKEND == 'pycurl':
+            status_code = _fetch_status_curl(url_record.url, _METHOD, timeout)
+        else:
+            request_kwargs = {'timeout': timeout, 'allow_redirects': _FOLLOW_REDIRECTS}
+            status_code = _fetch_status(session or _get_session(), url_record.url, _METHOD, request_kwargs)
+        # Consider any 2xx or 3xx status code as "up"
+        if not 200 <= status_code < 400:
+            error_message = f"HTTP Status {status_code}"
+
+    except requests.exceptions.Timeout:
+        error_message = "Request timed out"
+    except requests.exceptions.RequestException as e:
+        error_message = f"Connection error: {type(e).__name__}"
+    except Exception as e:
+        error_message = f"An unexpected error occurred: {e}"
+    # Milliseconds with two decimals, computed in integer nanoseconds
+    response_time = (perf_counter_ns() - start_ns) // 10_000 / 100
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Checked %s: UP=%s, RT=%sms", url_record.url, error_message is None, response_time)
+    return {
+        'url_id': url_record.id,
+        'is_up': error_message is None,
+        'status_code': status_code,
+        'response_time': response_time,
+        'error_message': error_message
+    }
+
+async def check_single_url_async(client, url_record: URLRecord) -> Dict[str, Any]:
+    """
+    Checks a single URL using a shared httpx client.
+
+    Args:
+        client: The httpx.AsyncClient shared by the whole check cycle.
+        url_record: The URLRecord object from the database.
+
+    Returns:
+        A dictionary containing the check results.
+    """
+    import httpx
+
+    # No pool timeout: queued checks wait for a free connection instead of failing
+    timeout = httpx.Timeout(url_record.timeout or _DEFAULT_TIMEOUT, pool=None)
+    status_code = error_message = None
+
+    start_ns = perf_counter_ns()
+    try:
+        if _METHOD == 'HEAD':
+            status_code = (await client.head(url_record.url, timeout=timeout)).status_code
+        if status_code is None or status_code in _HEAD_FALLBACK_STATUSES:
+            # Only the status line is needed: stream the GET and close it unread
+            async with client.stream('GET', url_record.url, timeout=timeout) as response:
+                status_code = response.status_code
+
+        # Consider any 2xx or 3xx status code as "up"
+        if not 200 <= status_code < 400:
+            error_message = f"HTTP Status {status_code}"
+
+    except httpx.TimeoutException:
+        error_message = "Request timed out"
+    except httpx.HTTPError as e:
+        error_message = f"Connection error: {type(e).__name__}"
+    except Exception as e:
+        error_message = f"An unexpected error occurred: {e}"
+    # Milliseconds with two decimals, computed in integer nanoseconds
+    response_time = (perf_counter_ns() - start_ns) // 10_000 / 100
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Checked %s: UP=%s, RT=%sms", url_record.url, error_message is None, response_time)
+    return {
+        'url_id': url_record.id,
+        'is_up': error_message is None,
+        'status_code': status_code,
+        'response_time': response_time,
+        'error_message': error_message
+    }
+
+async def check_urls_async(urls_to_check: List[URLRecord]) -> List[Dict[str, Any]]:
+    """
+    Checks URLs concurrently on a single event loop with httpx over HTTP/2.
+
+    Checks against the same origin share one multiplexed connection.
+    Requires the optional ``httpx[http2]`` dependency (``checker.backend = "httpx"``).
+
+    Args:
+        urls_to_check: The URLRecord objects to check.
+
+    Returns:
+        The check result dictionaries; URLs whose check raised are left out.
+    """
+    import httpx
+
+    max_workers = _CONFIG.get('checker.concurrent_limit', 10)
+    limits = httpx.Limits(max_connections=max_workers * 4, max_keepalive_connections=max_workers)
+
+    async with httpx.AsyncClient(
+        http2=True,
+        limits=limits,
+        headers=_HEADERS,
+        verify=_VERIFY_SSL,
+        follow_redirects=_FOLLOW_REDIRECTS
+    ) as client:
+        outcomes = await asyncio.gather(
+            *[check_single_url_async(client, url) for url in urls_to_check],
+            return_exceptions=True
+        )
+
+    results = []
+    for url_record, outcome in zip(urls_to_check, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error("Error processing check result for %s: %s", url_record.url, outcome)
+        else:
+            results.append(outcome)
+    return results
+
+def _resolve_host(host: str, port: int) -> None:
+    """Resolves a host so the system resolver cache is warm for the first check."""
+    try:
+        socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except OSError as e:
+        # The check itself will report the failure
+        logger.debug("DNS warmup failed for %s: %s", host, e)
+
+def _warm_dns(urls_to_check: List[URLRecord], max_workers: int) -> None:
+    """Resolves every distinct host concurrently before the check cycle starts."""
+    hosts = set()
+    for url_record in urls_to_check:
+        parts = urlsplit(url_record.url)
+        if parts.hostname:
+            hosts.add((parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80)))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(hosts)))) as executor:
+        for host, port in hosts:
+            executor.submit(_resolve_host, host, port)
+
+def _check_host_group(url_records: List[URLRecord],
+                      session: Optional[requests.Session] = None,
+                      results: Optional[List[Dict[str, Any]]] = None,
+                      abandoned: Optional[threading.Event] = None) -> List[Dict[str, Any]]:
+    """
+    Checks URLs sharing one origin sequentially, reusing a single keep-alive connection.
+
+    Each result is appended to ``results`` as soon as its check finishes, so a
+    caller giving up on the group still sees the checks that completed; once
+    ``abandoned`` is set no further URLs are started.
+    """
+    if results is None:
+        results = []
+    for url_record in url_records:
+        if abandoned is not None and abandoned.is_set():
+            break
+        results.append(check_single_url(url_record, session))
+    return results
+
+def _url_check_budget(url_record: URLRecord) -> float:
+    """Worst-case seconds for one check: every retry timing out plus urllib3's backoff sleeps."""
+    retries = _CONFIG.get('checker.retry_attempts', 2)
+    backoff = _CONFIG.get('checker.retry_delay', 3) * (2 ** retries - 1)
+    return (retries + 1) * (url_record.timeout or _DEFAULT_TIMEOUT) + backoff
+
+def _default_cycle_deadline(groups: List[List[URLRecord]], max_workers: int) -> float:
+    """
+    Cycle deadline covering the slowest host group in the worst case.
+
+    Groups run serially and queue for workers, so the budget of the largest
+    group is multiplied by the number of waves the pool needs.
+    """
+    waves = -(-len(groups) // max_workers)
+    return waves * max(sum(_url_check_budget(u) for u in group) for group in groups)
+
+def _deadline_result(url_record: URLRecord) -> Dict[str, Any]:
+    """The result recorded for a URL that was never checked before the cycle deadline."""
+    return {
         'url_id': url_record.id,
         'is_up': False,
         'status_code': None,
         'response_time': None,
-        'error_message': None
+        'error_message': "Check cycle deadline exceeded"
     }
 
-    headers = {'User-Agent': config.get('checker.user_agent', 'URLMonitor/1.0')}
-    timeout = url_record.timeout or config.get('checker.request_timeout', 10)
+def _check_urls_threaded(urls_to_check: List[URLRecord], max_workers: int,
+                         deadline: Optional[float] = None,
+                         session: Optional[requests.Session] = None) -> List[Dict[str, Any]]:
+    """
+    Checks URLs concurrently on a thread pool with requests.
 
-    start_time = perf_counter()
+    URLs are grouped by origin (scheme + host + port); each group runs on one
+    worker so N URLs spread over H hosts cost H handshakes instead of N.
+    Groups still unfinished after ``deadline`` seconds (by default the
+    worst-case time of the slowest group) are abandoned so one slow host
+    cannot stall the whole cycle: their completed checks are kept, the check
+    in flight is dropped and URLs never attempted are recorded as down.
+    """
+    if _CONFIG.get('checker.dns_warmup', False):
+        _warm_dns(urls_to_check, max_workers)
+
+    groups = defaultdict(list)
+    for url_record in urls_to_check:
+        parts = urlsplit(url_record.url)
+        groups[(parts.scheme, parts.netloc)].append(url_record)
+
+    if deadline is None:
+        deadline = _default_cycle_deadline(list(groups.values()), max_workers)
+
+    results = []
+    abandoned = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
     try:
-        response = requests.get(
-            url_record.url,
-            timeout=timeout,
-            headers=headers,
-            verify=config.get('checker.verify_ssl', True),
-            allow_redirects=config.get('checker.follow_redirects', True)
-        )
-        result['status_code'] = response.status_code
-        # Consider any 2xx or 3xx status code as "up"
-        if 200 <= response.status_code < 400:
-            result['is_up'] = True
-        else:
-            result['error_message'] = f"HTTP Status {response.status_code}"
+        future_to_group = {}
+        for group in groups.values():
+            partial = []
+            future = executor.submit(_check_host_group, group, session, partial, abandoned)
+            future_to_group[future] = (group, partial)
 
-    except requests.exceptions.Timeout:
-        result['error_message'] = "Request timed out"
-    except requests.exceptions.RequestException as e:
-        result['error_message'] = f"Connection error: {type(e).__name__}"
-    except Exception as e:
-        result['error_message'] = f"An unexpected error occurred: {e}"
-    finally:
-        end_time = perf_counter()
-        result['response_time'] = round((end_time - start_time) * 1000, 2) # in milliseconds
+        def collect(future):
+            group, _ = future_to_group[future]
+            try:
+                results.extend(future.result())
+            except Exception as e:
+                logger.error("Error processing check results for %d URL(s) starting with %s: %s", len(group), group[0].url, e)
 
-    logger.debug(f"Checked {url_record.url}: UP={result['is_up']}, RT={result['response_time']}ms")
-    return result
+        handled = set()
+        try:
+            for future in as_completed(future_to_group, timeout=deadline):
+                collect(future)
+                handled.add(future)
+        except FuturesTimeoutError:
+            abandoned.set()
+            unhandled = [f for f in future_to_group if f not in handled]
+            logger.warning("Check cycle deadline of %ss exceeded; abandoning %d host group(s).",
+                           deadline, sum(not f.done() for f in unhandled))
+            for future in unhandled:
+                group, partial = future_to_group[future]
+                if future.done():
+                    # Finished between as_completed's last yield and the timeout
+                    collect(future)
+                    continue
+                if future.cancel():
+                    # Never started: nothing in the group was attempted
+                    results.extend(_deadline_result(u) for u in group)
+                    continue
+                completed = list(partial)
+                results.extend(completed)
+                # group[len(completed)] is still in flight; its outcome is unknown
+                results.extend(_deadline_result(u) for u in group[len(completed) + 1:])
+    finally:
+        # Don't wait for abandoned checks; they end on their own request timeout
+        executor.shutdown(wait=False)
+    return results
 
-def run_all_checks() -> int:
+def run_all_checks(session: Optional[requests.Session] = None) -> int:
     """
     Retrieves all active URLs from the database and checks them concurrently.
     Saves the results back to the database.
 
+    The HTTP backend is selected by ``checker.backend``: ``"requests"`` (default)
+    and ``"pycurl"`` use a thread pool, ``"httpx"`` runs every check on one
+    asyncio event loop.
+
+    Args:
+        session: Long-lived session (see ``create_session``) shared by all
+            worker threads, so keep-alive connections survive between cycles.
+            Defaults to per-thread sessions.
+
     Returns:
         The number of URLs that were checked.
     """
@@ -84,34 +442,27 @@ def run_all_checks() -> int:
         logger.info("No active URLs to check.")
         return 0
 
-    checked_count = 0
     max_workers = config.get('checker.concurrent_limit', 10)
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_url = {executor.submit(check_single_url, url): url for url in urls_to_check}
+    if _BACKEND == 'httpx':
+        results = asyncio.run(check_urls_async(urls_to_check))
+    else:
+        # None derives the deadline from the host groups' worst-case check time
+        deadline = config.get('checker.cycle_deadline')
+        results = _check_urls_threaded(urls_to_check, max_workers, deadline, session)
 
-        for future in as_completed(future_to_url):
-            url_record = future_to_url[future]
-            try:
-                result = future.result()
-                db.save_check_result(
-                    url_id=result['url_id'],
-                    status_code=result['status_code'],
-                    response_time=result['response_time'],
-                    is_up=result['is_up'],
-                    error_message=result['error_message']
-                )
-                checked_count += 1
-            except Exception as e:
-                logger.error(f"Error processing check result for {url_record.url}: {e}")
+    global _cycle_id
+    checked_count = db.save_check_results_bulk(results)
+    _cycle_id += 1
 
-    logger.info(f"URL check cycle finished. Checked {checked_count} URLs.")
+    logger.info("URL check cycle finished. Checked %s URLs.", checked_count)
     
-    # Perform database cleanup if enabled
-    if config.get('database.auto_cleanup', True):
+    # Perform database cleanup if enabled, at most once per cleanup interval
+    cleanup_interval = config.get('database.cleanup_interval_sec', 86400)
+    if config.get('database.auto_cleanup', True) and time.time() - db.get_last_cleanup_time() >= cleanup_interval:
         retention_days = config.get('database.retention_days', 30)
-        logger.info(f"Running automatic cleanup of records older than {retention_days} days.")
+        logger.info("Running automatic cleanup of records older than %s days.", retention_days)
         deleted_count = db.cleanup_old_records(retention_days)
-        logger.info(f"Cleanup complete. Removed {deleted_count} old records.")
+        logger.info("Cleanup complete. Removed %s old records.", deleted_count)
         
     return checked_count
\ No newline at end of file
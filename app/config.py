@@ -4,16 +4,88 @@ Handles environment-based configuration with defaults optimized for Render free
 """
 
 import os
+import copy
 import json
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+# Sentinel for cache misses, since None is a valid configuration value
+_MISSING = object()
+
+# Parsed config files keyed by (resolved path, mtime_ns, size); an edited file gets a new key
+_CONFIG_CACHE: Dict[tuple, Dict[str, Any]] = {}
+
+
+def _build_default_config() -> Dict[str, Any]:
+    """Default configuration optimized for Render free tier"""
+    return {
+        "application": {
+            "name": "URL Monitor",
+            "version": "1.0.0",
+            "timezone": os.getenv('MONITOR_TIMEZONE', 'UTC')
+        },
+        "scheduler": {
+            "enabled": True,
+            "schedules": ["06:00", "14:00", "20:00"],
+            "run_on_startup": False
+        },
+        "checker": {
+            "backend": "requests",
+            "request_timeout": int(os.getenv('MONITOR_TIMEOUT', '10')),
+            "connect_timeout": 5,
+            "read_timeout": 10,
+            "concurrent_limit": 10,
+            "cycle_deadline": None,
+            "retry_attempts": 2,
+            "retry_delay": 3,
+            "user_agent": "URLMonitor/1.0",
+            "verify_ssl": True,
+            "follow_redirects": True,
+            "method": "HEAD",
+            "dns_warmup": False,
+            "max_redirects": 3
+        },
+        "database": {
+            "path": os.getenv('MONITOR_DB', 'data/monitor.db'),
+            "retention_days": 30,
+            "auto_cleanup": True,
+            "cleanup_interval_sec": 86400,
+            "backup_enabled": False,
+            "connection_timeout": 30,
+            "pool_size": 4
+        },
+        "dashboard": {
+            "enabled": True,
+            "host": os.getenv('MONITOR_HOST', '0.0.0.0'),
+            "port": int(os.getenv('PORT', os.getenv('MONITOR_PORT', '8080'))),
+            "debug": os.getenv('FLASK_DEBUG', 'false').lower() == 'true',
+            "secret_key": os.getenv('SECRET_KEY', 'dev-key-change-in-production'),
+            "cache_ttl": 30,
+            "template_reload": False
+        },
+        "logging": {
+            "level": os.getenv('MONITOR_LOG_LEVEL', 'INFO'),
+            "file": "logs/monitor.log",
+            "max_size": "10MB",
+            "backup_count": 5,
+            "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        },
+        "performance": {
+            "max_memory_mb": 200,
+            "cleanup_interval": 3600,
+            "response_time_threshold": 30.0,
+            "error_threshold": 5
+        }
+    }
+
+
 class Config:
     """Configuration management class"""
     
     def __init__(self, config_file: Optional[str] = None):
         self.config_file = config_file or os.getenv('MONITOR_CONFIG', 'config.json')
         self._config = self._load_config()
+        self._get_cache: Dict[str, Any] = {}
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file or create default"""
@@ -21,68 +93,18 @@ class Config:
         
         if config_path.exists():
             try:
-                with open(config_path, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
+                st = config_path.stat()
+                cache_key = (str(config_path.resolve()), st.st_mtime_ns, st.st_size)
+                if cache_key not in _CONFIG_CACHE:
+                    with open(config_path, 'r') as f:
+                        _CONFIG_CACHE[cache_key] = json.load(f)
+                # Hand out a copy so set()/update() never touch the cached dict
+                return copy.deepcopy(_CONFIG_CACHE[cache_key])
+            except (json.JSONDecodeError, OSError) as e:
                 print(f"Warning: Could not load config file {config_path}: {e}")
                 print("Using default configuration")
         
-        return self._default_config()
-    
-    def _default_config(self) -> Dict[str, Any]:
-        """Default configuration optimized for Render free tier"""
-        return {
-            "application": {
-                "name": "URL Monitor",
-                "version": "1.0.0",
-                "timezone": os.getenv('MONITOR_TIMEZONE', 'UTC')
-            },
-            "scheduler": {
-                "enabled": True,
-                "schedules": ["06:00", "14:00", "20:00"],
-                "run_on_startup": False
-            },
-            "checker": {
-                "request_timeout": int(os.getenv('MONITOR_TIMEOUT', '10')),
-                "connect_timeout": 5,
-                "read_timeout": 10,
-                "concurrent_limit": 10,
-                "retry_attempts": 2,
-                "retry_delay": 3,
-                "user_agent": "URLMonitor/1.0",
-                "verify_ssl": True,
-                "follow_redirects": True,
-                "max_redirects": 3
-            },
-            "database": {
-                "path": os.getenv('MONITOR_DB', 'data/monitor.db'),
-                "retention_days": 30,
-                "auto_cleanup": True,
-                "backup_enabled": False,
-                "connection_timeout": 30
-            },
-            "dashboard": {
-                "enabled": True,
-                "host": os.getenv('MONITOR_HOST', '0.0.0.0'),
-                "port": int(os.getenv('PORT', os.getenv('MONITOR_PORT', '8080'))),
-                "debug": os.getenv('FLASK_DEBUG', 'false').lower() == 'true',
-                "secret_key": os.getenv('SECRET_KEY', 'dev-key-change-in-production'),
-                "template_reload": False
-            },
-            "logging": {
-                "level": os.getenv('MONITOR_LOG_LEVEL', 'INFO'),
-                "file": "logs/monitor.log",
-                "max_size": "10MB",
-                "backup_count": 5,
-                "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-            },
-            "performance": {
-                "max_memory_mb": 200,
-                "cleanup_interval": 3600,
-                "response_time_threshold": 30.0,
-                "error_threshold": 5
-            }
-        }
+        return _build_default_config()
     
     def save_config(self) -> bool:
         """Save current configuration to file"""
@@ -98,16 +120,20 @@ class Config:
             return False
     
     def get(self, key: str, default: Any = None) -> Any:
-        """Get configuration value using dot notation"""
-        keys = key.split('.')
-        value = self._config
+        """Get configuration value using dot notation (resolved paths are cached)"""
+        value = self._get_cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
         
+        value = self._config
         try:
-            for k in keys:
+            for k in key.split('.'):
                 value = value[k]
-            return value
         except (KeyError, TypeError):
             return default
+        
+        self._get_cache[key] = value
+        return value
     
     def set(self, key: str, value: Any) -> None:
         """Set configuration value using dot notation"""
@@ -120,6 +146,7 @@ class Config:
             config = config[k]
         
         config[keys[-1]] = value
+        self._get_cache.clear()
     
     def update(self, updates: Dict[str, Any]) -> None:
         """Update configuration with new values"""
@@ -132,6 +159,7 @@ class Config:
             return base_dict
         
         deep_update(self._config, updates)
+        self._get_cache.clear()
     
     def validate(self) -> tuple:
         """Validate configuration and return (is_valid, errors)"""
@@ -205,9 +233,10 @@ def get_config() -> Config:
 def create_default_config(output_file: str = 'config.json') -> bool:
     """Create default configuration file"""
     try:
-        temp_config = Config()
-        temp_config.config_file = output_file
-        return temp_config.save_config()
+        config_path = Path(output_file)
+        config_path.parent.mkdir(parents=True, exist_ok=True)
+        config_path.write_text(json.dumps(_build_default_config(), indent=2))
+        return True
     except Exception as e:
         print(f"Error creating default config: {e}")
         return False
\ No newline at end of file
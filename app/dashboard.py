@@ -5,12 +5,16 @@ Flask Web Dashboard for URL Monitor
 Provides a web interface and API to view monitoring status.
 """
 
-import json
-from flask import Flask, render_template, jsonify
+import time
+import hashlib
+import orjson
+from functools import lru_cache
+from flask import Flask, Response, render_template, request
 from datetime import datetime
 
 from app.config import get_config
-from app.database import get_database
+from app.database import StatusRow, _days_ago_iso, get_database
+from app.checker import get_cycle_id
 
 # --- CHANGE START ---
 # We need to tell Flask where to find the 'templates' and 'static' folders,
@@ -21,6 +25,75 @@ template_folder = os.path.join(project_root, 'templates')
 static_folder = os.path.join(project_root, 'static')
 # --- CHANGE END ---
 
+# Latest status snapshot shared by the index page and /api/status. Replaced
+# wholesale (never mutated) so concurrent requests always see a consistent entry.
+_STATUS_CACHE = {'ts': 0.0, 'cycle_id': None, 'statuses': None, 'payload': None, 'etag': None}
+
+
+def _get_status_snapshot(ttl: float) -> dict:
+    """Get all URL statuses, re-reading the database once the TTL expires or a check cycle completes."""
+    global _STATUS_CACHE
+    cache = _STATUS_CACHE
+    now = time.monotonic()
+    cycle_id = get_cycle_id()
+    
+    if cache['statuses'] is None or cache['cycle_id'] != cycle_id or now - cache['ts'] >= ttl:
+        statuses = list(get_database().iter_all_status())
+        payload = orjson.dumps(statuses, default=StatusRow._asdict, option=orjson.OPT_NAIVE_UTC)
+        cache = {
+            'ts': now,
+            'cycle_id': cycle_id,
+            'statuses': statuses,
+            'payload': payload,
+            'etag': hashlib.sha1(payload).hexdigest()
+        }
+        _STATUS_CACHE = cache
+    
+    return cache
+
+
+def _json_response(data, status: int = 200) -> Response:
+    """Serialize data with orjson (datetimes and dataclasses natively) into a JSON response."""
+    return Response(orjson.dumps(data, option=orjson.OPT_NAIVE_UTC), status=status, mimetype='application/json')
+
+
+def _history_window() -> str:
+    """Start of the 7-day history window, truncated to the hour (YYYY-MM-DD HH)"""
+    return _days_ago_iso(7)[:13]
+
+
+@lru_cache(maxsize=512)
+def _get_history_payload(url_id: int, url: str, last_check_id, window: str) -> bytes:
+    """
+    Serialized 7-day history for a URL. Keyed on the URL's latest check ID, so
+    a new check (from any process) produces a new cache entry, and on the
+    hour-truncated window start, so old points age out even when no checks arrive.
+    """
+    history = get_database().get_url_history(url_id, days=7)
+    return orjson.dumps({"url": url, "history": history}, option=orjson.OPT_NAIVE_UTC)
+
+
+def format_datetime(value, format="%Y-%m-%d %H:%M:%S"):
+    """A custom Jinja filter to format datetime objects."""
+    if value is None:
+        return ""
+
+    # Special case to handle the string 'now' for the current time
+    if value == 'now':
+        # Use UTC time to be consistent
+        dt = datetime.utcnow()
+        return dt.strftime(format)
+
+    # Handle actual datetime objects or ISO strings from the database
+    dt = value
+    if isinstance(value, str):
+        try:
+            dt = datetime.fromisoformat(value)
+        except ValueError:
+            return value  # If it's not a valid date string, just return it as is
+
+    return dt.strftime(format)
+
 
 def create_app():
     """Create and configure the Flask application."""
@@ -31,59 +104,36 @@ def create_app():
     
     config = get_config()
     
-    class CustomJSONEncoder(json.JSONEncoder):
-        def default(self, obj):
-            if isinstance(obj, datetime):
-                return obj.isoformat()
-            return super().default(obj)
-
-    app.json_encoder = CustomJSONEncoder
-
-    # This is a helper function to make dates look nice in the template
-    @app.template_filter('datetimeformat')
-    def format_datetime(value, format="%Y-%m-%d %H:%M:%S"):
-        """A custom Jinja filter to format datetime objects."""
-        if value is None:
-            return ""
-
-        # Special case to handle the string 'now' for the current time
-        if value == 'now':
-            # Use UTC time to be consistent
-            dt = datetime.utcnow()
-            return dt.strftime(format)
-
-        # Handle actual datetime objects or ISO strings from the database
-        dt = value
-        if isinstance(value, str):
-            try:
-                dt = datetime.fromisoformat(value)
-            except ValueError:
-                return value  # If it's not a valid date string, just return it as is
-
-        return dt.strftime(format)
-
-
+    # Helper filter to make dates look nice in the templates
+    app.add_template_filter(format_datetime, 'datetimeformat')
+    
     @app.route('/')
     def index():
         """Dashboard homepage."""
-        db = get_database()
-        all_status = db.get_all_status()
+        all_status = _get_status_snapshot(config.get('dashboard.cache_ttl', 30))['statuses']
         
-        stats = {
-            'total': len(all_status),
-            'up': sum(1 for s in all_status if s.get('is_up')),
-            'down': sum(1 for s in all_status if s.get('is_up') is False and s.get('checked_at')),
-            'pending': sum(1 for s in all_status if s.get('last_checked') is None)
-        }
+        # Tally in a single pass; is_up comes back from SQLite as 0/1
+        total = up = down = pending = 0
+        for s in all_status:
+            total += 1
+            if s.is_up:
+                up += 1
+            elif s.last_checked is None:
+                pending += 1
+            else:
+                down += 1
+        stats = {'total': total, 'up': up, 'down': down, 'pending': pending}
         
         return render_template('index.html', statuses=all_status, stats=stats)
 
     @app.route('/api/status')
     def api_status():
         """JSON API endpoint for the status of all URLs."""
-        db = get_database()
-        all_status = db.get_all_status()
-        return jsonify(all_status)
+        snapshot = _get_status_snapshot(config.get('dashboard.cache_ttl', 30))
+        response = Response(snapshot['payload'], mimetype='application/json')
+        response.set_etag(snapshot['etag'])
+        # Answers 304 Not Modified when If-None-Match matches the ETag
+        return response.make_conditional(request)
 
     @app.route('/api/history/<int:url_id>')
     def api_history(url_id: int):
@@ -91,12 +141,12 @@ def create_app():
         db = get_database()
         url = db.get_url(url_id)
         if not url:
-            return jsonify({"error": "URL not found"}), 404
+            return _json_response({"error": "URL not found"}, status=404)
         
-        history = db.get_url_history(url_id, days=7)
-        return jsonify({
-            "url": url.url,
-            "history": history
-        })
+        last_check_id = db.get_latest_check_id(url_id)
+        window = _history_window()
+        response = Response(_get_history_payload(url_id, url.url, last_check_id, window), mimetype='application/json')
+        response.set_etag(f"{url_id}-{last_check_id}-{window.replace(' ', 'T')}")
+        return response.make_conditional(request)
 
     return app
\ No newline at end of file
@@ -5,17 +5,87 @@ SQLite-based storage optimized for Render free tier
 
 import sqlite3
 import logging
+import queue
 import threading
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any, Union
+from typing import Dict, Final, Iterator, List, NamedTuple, Optional, Tuple, Any, Union
 from contextlib import contextmanager
+from functools import lru_cache
 from dataclasses import dataclass
 
 from .config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Statement cache size per connection (sqlite3 default is 128)
+_CACHED_STATEMENTS = 256
+
+# Rows fetched per round-trip when streaming large result sets
+_FETCH_SIZE = 256
+
+# Rows removed per transaction by cleanup_old_records, keeping the WAL small
+_CLEANUP_BATCH_SIZE = 5000
+
+# Convert "[boolean]"/"[timestamp]" typed column aliases while rows are
+# fetched (enabled per query through PARSE_COLNAMES)
+sqlite3.register_converter("boolean", lambda value: value != b"0")
+sqlite3.register_converter("timestamp", lambda value: datetime.fromisoformat(value.decode()))
+
+# Bind datetimes in the same "YYYY-MM-DD HH:MM:SS" form CURRENT_TIMESTAMP stores
+# (the sqlite3 default adapter is deprecated as of Python 3.12)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(sep=' ', timespec='seconds'))
+
+
+def _days_ago_iso(days: int) -> str:
+    """Timestamp string for `days` ago, comparable with stored checked_at values"""
+    return (datetime.now() - timedelta(days=days)).isoformat(sep=' ', timespec='seconds')
+
+# URLRecord fields in declaration order, so a plain tuple row maps onto it
+_URL_COLUMNS: Final[str] = """
+    id, url, name, timeout,
+    is_active AS "is_active [boolean]",
+    created_at AS "created_at [timestamp]",
+    updated_at AS "updated_at [timestamp]",
+    last_checked AS "last_checked [timestamp]"
+"""
+
+# SQL for the hot paths, kept as constants so every call hits the
+# connection's statement cache with an identical key
+_SELECT_URL_BY_ID: Final[str] = f"SELECT {_URL_COLUMNS} FROM urls_v WHERE id = ?"
+_SELECT_URL_BY_ADDRESS: Final[str] = f"SELECT {_URL_COLUMNS} FROM urls_v WHERE url = ?"
+
+_INSERT_CHECK: Final[str] = """
+    INSERT INTO url_checks 
+    (url_id, status_code, response_time, is_up, error_message, checked_at)
+    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+_SELECT_ALL_STATUS: Final[str] = """
+    SELECT u.id, u.url, u.name, u.is_active, latest.checked_at AS last_checked,
+           latest.status_code, latest.response_time, 
+           latest.is_up, latest.error_message, latest.checked_at
+    FROM urls u
+    LEFT JOIN url_checks latest ON latest.id = (
+        SELECT id FROM url_checks
+        WHERE url_id = u.id
+        ORDER BY checked_at DESC, id DESC
+        LIMIT 1
+    )
+    ORDER BY u.created_at
+"""
+
+# Columns update_url() may change
+_UPDATABLE_URL_FIELDS = frozenset({'name', 'timeout', 'is_active'})
+
+
+@lru_cache(maxsize=32)
+def _build_update_sql(fields: Tuple[str, ...]) -> str:
+    """Build the UPDATE statement for one combination of URL fields"""
+    set_clauses = ', '.join(f"{field} = ?" for field in fields)
+    return f"UPDATE urls SET {set_clauses}, updated_at = CURRENT_TIMESTAMP WHERE id = ?"
+
 
 @dataclass
 class URLRecord:
@@ -30,6 +100,20 @@ class URLRecord:
     last_checked: Optional[datetime]
 
 
+class StatusRow(NamedTuple):
+    """Latest status of a URL, as produced by iter_all_status"""
+    id: int
+    url: str
+    name: Optional[str]
+    is_active: int
+    last_checked: Optional[str]
+    status_code: Optional[int]
+    response_time: Optional[float]
+    is_up: Optional[int]
+    error_message: Optional[str]
+    checked_at: Optional[str]
+
+
 @dataclass
 class CheckResult:
     """Data class for URL check results"""
@@ -48,53 +132,99 @@ class DatabaseManager:
     def __init__(self, db_path: Optional[str] = None):
         self.config = get_config()
         self.db_path = db_path or self.config.get('database.path', 'data/monitor.db')
-        self._local = threading.local()
         self._lock = threading.Lock()
         self._initialized = False
         
         # Ensure database directory exists
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
         
+        # Bounded connection pool; every ":memory:" connection is a separate
+        # database, so an in-memory database gets exactly one
+        if self.db_path == ':memory:':
+            self._pool_size = 1
+        else:
+            self._pool_size = max(1, self.config.get('database.pool_size', 4))
+        self._pool = queue.LifoQueue(maxsize=self._pool_size)
+        self._pool_lock = threading.Lock()
+        
+        for _ in range(self._pool_size):
+            self._pool.put(self._new_connection())
+        self._open_connections = self._pool_size
+        
         # Initialize database on first access
         self.initialize()
     
-    @property
-    def connection(self) -> sqlite3.Connection:
-        """Get thread-local database connection"""
-        if not hasattr(self._local, 'connection') or self._local.connection is None:
-            conn = sqlite3.connect(
-                self.db_path,
-                timeout=self.config.get('database.connection_timeout', 30),
-                check_same_thread=False
-            )
-            
-            # Enable foreign keys and optimize SQLite
-            conn.execute("PRAGMA foreign_keys = ON")
-            conn.execute("PRAGMA journal_mode = WAL")
-            conn.execute("PRAGMA synchronous = NORMAL")
-            conn.execute("PRAGMA cache_size = 10000")
-            conn.execute("PRAGMA temp_store = MEMORY")
-            
-            # Row factory for dict-like access
-            conn.row_factory = sqlite3.Row
-            
-            self._local.connection = conn
+    def _new_connection(self) -> sqlite3.Connection:
+        """Open and tune a new pool connection"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.config.get('database.connection_timeout', 30),
+            check_same_thread=False,
+            cached_statements=_CACHED_STATEMENTS,
+            detect_types=sqlite3.PARSE_COLNAMES
+        )
+        
+        # Let cleanup hand freed pages back without a full VACUUM; only takes
+        # effect on a fresh database, so it must precede the WAL switch
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
         
-        return self._local.connection
+        # Enable foreign keys and optimize SQLite
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA cache_size = 10000")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA mmap_size = 268435456")  # read pages via mmap (256 MB)
+        
+        # Row factory for dict-like access
+        conn.row_factory = sqlite3.Row
+        
+        return conn
     
     @contextmanager
-    def get_cursor(self):
-        """Get database cursor with automatic transaction handling"""
-        cursor = self.connection.cursor()
+    def get_connection(self):
+        """Borrow a connection from the pool, reopening one if the pool was closed"""
         try:
-            yield cursor
-            self.connection.commit()
-        except Exception as e:
-            self.connection.rollback()
-            logger.error(f"Database error: {e}")
-            raise
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                can_open = self._open_connections < self._pool_size
+                if can_open:
+                    self._open_connections += 1
+            if can_open:
+                try:
+                    conn = self._new_connection()
+                except Exception:
+                    with self._pool_lock:
+                        self._open_connections -= 1
+                    raise
+            else:
+                conn = self._pool.get()
+        try:
+            yield conn
         finally:
-            cursor.close()
+            self._pool.put(conn)
+    
+    @contextmanager
+    def get_cursor(self, raw: bool = False):
+        """Get database cursor with automatic transaction handling
+        
+        With raw=True rows come back as plain tuples instead of sqlite3.Row,
+        for hot paths that unpack columns positionally.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if raw:
+                cursor.row_factory = None
+            try:
+                yield cursor
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error("Database error: %s", e)
+                raise
+            finally:
+                cursor.close()
     
     def initialize(self) -> bool:
         """Initialize database schema"""
@@ -106,6 +236,8 @@ class DatabaseManager:
                 if self._initialized:  # Double-check pattern
                     return True
                 
+                self._enable_incremental_vacuum()
+                
                 with self.get_cursor() as cursor:
                     # Create URLs table
                     cursor.execute("""
@@ -116,8 +248,7 @@ class DatabaseManager:
                             timeout INTEGER DEFAULT 10,
                             is_active BOOLEAN DEFAULT 1,
                             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                            last_checked TIMESTAMP
+                            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                         )
                     """)
                     
@@ -145,15 +276,43 @@ class DatabaseManager:
                     """)
                     
                     # Create indexes for performance
-                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_url_checks_url_id ON url_checks(url_id)")
-                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_url_checks_checked_at ON url_checks(checked_at)")
-                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_urls_active ON urls(is_active)")
-                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_urls_last_checked ON urls(last_checked)")
+                    # Covers get_uptime_stats so its aggregates never touch the table rows;
+                    # its (url_id, checked_at) prefix also serves the latest-check seek,
+                    # MAX(checked_at) per URL and per-URL deletes
+                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_url_checks_stats_cov ON url_checks(url_id, checked_at, is_up, response_time)")
+                    cursor.execute("DROP INDEX IF EXISTS idx_url_checks_url_id_checked_at")
+                    cursor.execute("DROP INDEX IF EXISTS idx_url_checks_url_id")
+                    # Lets cleanup walk expired checks oldest-first as a range scan
+                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_url_checks_cleanup ON url_checks(checked_at)")
+                    cursor.execute("DROP INDEX IF EXISTS idx_url_checks_checked_at")
+                    # Partial index: only active URLs, already in list_urls' created_at order
+                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_urls_active_partial ON urls(created_at) WHERE is_active = 1")
+                    cursor.execute("DROP INDEX IF EXISTS idx_urls_active")
+                    
+                    # last_checked is derived from url_checks (an index seek on
+                    # idx_url_checks_stats_cov) instead of being written
+                    # back to urls on every check
+                    cursor.execute("DROP INDEX IF EXISTS idx_urls_last_checked")
+                    cursor.execute("PRAGMA table_info(urls)")
+                    if any(col['name'] == 'last_checked' for col in cursor.fetchall()):
+                        try:
+                            cursor.execute("ALTER TABLE urls DROP COLUMN last_checked")
+                        except sqlite3.OperationalError as e:
+                            # DROP COLUMN needs SQLite 3.35+; the stale column is harmless
+                            logger.warning("Could not drop urls.last_checked: %s", e)
+                    cursor.execute("""
+                        CREATE VIEW IF NOT EXISTS urls_v AS
+                        SELECT u.id, u.url, u.name, u.timeout, u.is_active,
+                               u.created_at, u.updated_at,
+                               (SELECT MAX(checked_at) FROM url_checks
+                                WHERE url_id = u.id) AS last_checked
+                        FROM urls u
+                    """)
                     
                     # Set database version
                     cursor.execute("""
                         INSERT OR REPLACE INTO system_info (key, value, updated_at)
-                        VALUES ('schema_version', '1.0.0', CURRENT_TIMESTAMP)
+                        VALUES ('schema_version', '1.1.0', CURRENT_TIMESTAMP)
                     """)
                     
                     logger.info("Database initialized successfully")
@@ -161,9 +320,27 @@ class DatabaseManager:
                     return True
                     
         except Exception as e:
-            logger.error(f"Failed to initialize database: {e}")
+            logger.error("Failed to initialize database: %s", e)
             return False
     
+    def _enable_incremental_vacuum(self) -> None:
+        """Switch a database created without auto_vacuum to incremental mode
+        
+        PRAGMA auto_vacuum only applies to new files; an existing one needs a
+        one-time VACUUM before cleanup_old_records' incremental_vacuum can
+        hand pages back.
+        """
+        with self.get_connection() as conn:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 0:
+                return
+            logger.info("Rebuilding database to enable incremental auto_vacuum")
+            try:
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+            except sqlite3.OperationalError as e:
+                # e.g. another process holds a lock; retried on the next start
+                logger.warning("Could not enable incremental auto_vacuum: %s", e)
+    
     def add_url(self, url: str, name: Optional[str] = None, 
                 timeout: int = 10, active: bool = True) -> Optional[int]:
         """Add a new URL to monitor"""
@@ -175,21 +352,41 @@ class DatabaseManager:
                 """, (url, name, timeout, active))
                 
                 url_id = cursor.lastrowid
-                logger.info(f"Added URL: {url} (ID: {url_id})")
+                logger.info("Added URL: %s (ID: %s)", url, url_id)
                 return url_id
                 
         except sqlite3.IntegrityError:
-            logger.warning(f"URL already exists: {url}")
+            logger.warning("URL already exists: %s", url)
+            return None
+        except Exception as e:
+            logger.error("Failed to add URL %s: %s", url, e)
             return None
+    
+    def add_urls_bulk(self, urls: List[str], timeout: int = 10, active: bool = True) -> Optional[int]:
+        """Add many URLs in a single transaction, skipping ones already monitored (None on failure)"""
+        if not urls:
+            return 0
+        
+        try:
+            with self.get_cursor() as cursor:
+                cursor.executemany("""
+                    INSERT OR IGNORE INTO urls (url, name, timeout, is_active, created_at, updated_at)
+                    VALUES (?, NULL, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                """, [(url, timeout, active) for url in urls])
+                
+                added_count = cursor.rowcount
+                logger.info("Added %s of %s URLs", added_count, len(urls))
+                return added_count
+                
         except Exception as e:
-            logger.error(f"Failed to add URL {url}: {e}")
+            logger.error("Failed to add %s URLs: %s", len(urls), e)
             return None
     
     def get_url(self, url_id: int) -> Optional[URLRecord]:
         """Get URL by ID"""
         try:
-            with self.get_cursor() as cursor:
-                cursor.execute("SELECT * FROM urls WHERE id = ?", (url_id,))
+            with self.get_cursor(raw=True) as cursor:
+                cursor.execute(_SELECT_URL_BY_ID, (url_id,))
                 row = cursor.fetchone()
                 
                 if row:
@@ -197,14 +394,14 @@ class DatabaseManager:
                 return None
                 
         except Exception as e:
-            logger.error(f"Failed to get URL {url_id}: {e}")
+            logger.error("Failed to get URL %s: %s", url_id, e)
             return None
     
     def get_url_by_address(self, url: str) -> Optional[URLRecord]:
         """Get URL by address"""
         try:
-            with self.get_cursor() as cursor:
-                cursor.execute("SELECT * FROM urls WHERE url = ?", (url,))
+            with self.get_cursor(raw=True) as cursor:
+                cursor.execute(_SELECT_URL_BY_ADDRESS, (url,))
                 row = cursor.fetchone()
                 
                 if row:
@@ -212,14 +409,14 @@ class DatabaseManager:
                 return None
                 
         except Exception as e:
-            logger.error(f"Failed to get URL {url}: {e}")
+            logger.error("Failed to get URL %s: %s", url, e)
             return None
     
     def list_urls(self, active_only: bool = False) -> List[URLRecord]:
         """List all URLs"""
         try:
-            with self.get_cursor() as cursor:
-                query = "SELECT * FROM urls"
+            with self.get_cursor(raw=True) as cursor:
+                query = f"SELECT {_URL_COLUMNS} FROM urls_v"
                 params = ()
                 
                 if active_only:
@@ -228,12 +425,17 @@ class DatabaseManager:
                 query += " ORDER BY created_at"
                 
                 cursor.execute(query, params)
-                rows = cursor.fetchall()
                 
-                return [self._row_to_url_record(row) for row in rows]
+                records = []
+                rows = cursor.fetchmany(_FETCH_SIZE)
+                while rows:
+                    records.extend(self._row_to_url_record(row) for row in rows)
+                    rows = cursor.fetchmany(_FETCH_SIZE)
+                
+                return records
                 
         except Exception as e:
-            logger.error(f"Failed to list URLs: {e}")
+            logger.error("Failed to list URLs: %s", e)
             return []
     
     def update_url(self, url_id: int, **kwargs) -> bool:
@@ -242,35 +444,26 @@ class DatabaseManager:
             return False
         
         try:
-            # Build dynamic update query
-            set_clauses = []
-            params = []
-            
-            allowed_fields = {'name', 'timeout', 'is_active', 'last_checked'}
-            for field, value in kwargs.items():
-                if field in allowed_fields:
-                    set_clauses.append(f"{field} = ?")
-                    params.append(value)
-            
-            if not set_clauses:
+            # Sorted so each field combination maps to one cached statement
+            fields = tuple(sorted(field for field in kwargs if field in _UPDATABLE_URL_FIELDS))
+            if not fields:
                 return False
             
-            set_clauses.append("updated_at = CURRENT_TIMESTAMP")
+            params = [kwargs[field] for field in fields]
             params.append(url_id)
             
             with self.get_cursor() as cursor:
-                query = f"UPDATE urls SET {', '.join(set_clauses)} WHERE id = ?"
-                cursor.execute(query, params)
+                cursor.execute(_build_update_sql(fields), params)
                 
                 if cursor.rowcount > 0:
-                    logger.info(f"Updated URL {url_id}")
+                    logger.info("Updated URL %s", url_id)
                     return True
                 else:
-                    logger.warning(f"URL {url_id} not found for update")
+                    logger.warning("URL %s not found for update", url_id)
                     return False
                     
         except Exception as e:
-            logger.error(f"Failed to update URL {url_id}: {e}")
+            logger.error("Failed to update URL %s: %s", url_id, e)
             return False
     
     def delete_url(self, url_id: int) -> bool:
@@ -280,14 +473,14 @@ class DatabaseManager:
                 cursor.execute("DELETE FROM urls WHERE id = ?", (url_id,))
                 
                 if cursor.rowcount > 0:
-                    logger.info(f"Deleted URL {url_id}")
+                    logger.info("Deleted URL %s", url_id)
                     return True
                 else:
-                    logger.warning(f"URL {url_id} not found for deletion")
+                    logger.warning("URL %s not found for deletion", url_id)
                     return False
                     
         except Exception as e:
-            logger.error(f"Failed to delete URL {url_id}: {e}")
+            logger.error("Failed to delete URL %s: %s", url_id, e)
             return False
     
     def delete_url_by_address(self, url: str) -> bool:
@@ -297,14 +490,14 @@ class DatabaseManager:
                 cursor.execute("DELETE FROM urls WHERE url = ?", (url,))
                 
                 if cursor.rowcount > 0:
-                    logger.info(f"Deleted URL {url}")
+                    logger.info("Deleted URL %s", url)
                     return True
                 else:
-                    logger.warning(f"URL {url} not found for deletion")
+                    logger.warning("URL %s not found for deletion", url)
                     return False
                     
         except Exception as e:
-            logger.error(f"Failed to delete URL {url}: {e}")
+            logger.error("Failed to delete URL %s: %s", url, e)
             return False
     
     def save_check_result(self, url_id: int, status_code: Optional[int], 
@@ -313,38 +506,45 @@ class DatabaseManager:
         """Save URL check result"""
         try:
             with self.get_cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO url_checks 
-                    (url_id, status_code, response_time, is_up, error_message, checked_at)
-                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """, (url_id, status_code, response_time, is_up, error_message))
-                
-                check_id = cursor.lastrowid
-                
-                # Update last_checked timestamp in urls table
-                cursor.execute("""
-                    UPDATE urls SET last_checked = CURRENT_TIMESTAMP 
-                    WHERE id = ?
-                """, (url_id,))
+                cursor.execute(_INSERT_CHECK, (url_id, status_code, response_time, is_up, error_message))
                 
-                return check_id
+                return cursor.lastrowid
                 
         except Exception as e:
-            logger.error(f"Failed to save check result for URL {url_id}: {e}")
+            logger.error("Failed to save check result for URL %s: %s", url_id, e)
             return None
     
+    def save_check_results_bulk(self, results: List[Dict[str, Any]]) -> int:
+        """Save many URL check results in a single transaction"""
+        if not results:
+            return 0
+        
+        rows = [
+            (r['url_id'], r['status_code'], r['response_time'], r['is_up'], r['error_message'])
+            for r in results
+        ]
+        
+        try:
+            with self.get_cursor() as cursor:
+                cursor.executemany(_INSERT_CHECK, rows)
+                return len(rows)
+                
+        except Exception as e:
+            logger.error("Failed to save %s check results: %s", len(rows), e)
+            return 0
+    
     def get_url_status(self, url_id: int) -> Optional[Dict[str, Any]]:
         """Get latest status for a URL"""
         try:
             with self.get_cursor() as cursor:
                 cursor.execute("""
                     SELECT u.*, 
-                           uc.status_code, uc.response_time, uc.is_up, 
+                           uc.status_code, uc.response_time, uc.is_up AS "is_up [boolean]", 
                            uc.error_message, uc.checked_at
-                    FROM urls u
+                    FROM urls_v u
                     LEFT JOIN url_checks uc ON u.id = uc.url_id
                     WHERE u.id = ?
-                    ORDER BY uc.checked_at DESC
+                    ORDER BY uc.checked_at DESC, uc.id DESC
                     LIMIT 1
                 """, (url_id,))
                 
@@ -354,59 +554,68 @@ class DatabaseManager:
                 return None
                 
         except Exception as e:
-            logger.error(f"Failed to get URL status {url_id}: {e}")
+            logger.error("Failed to get URL status %s: %s", url_id, e)
             return None
     
-    def get_all_status(self) -> List[Dict[str, Any]]:
-        """Get current status of all URLs"""
+    def iter_all_status(self) -> Iterator[StatusRow]:
+        """Stream the current status of all URLs
+        
+        Holds a pooled connection until the iterator is exhausted or closed,
+        so don't issue other queries from inside the loop.
+        """
         try:
-            with self.get_cursor() as cursor:
-                cursor.execute("""
-                    SELECT u.id, u.url, u.name, u.is_active, u.last_checked,
-                           latest.status_code, latest.response_time, 
-                           latest.is_up, latest.error_message, latest.checked_at
-                    FROM urls u
-                    LEFT JOIN (
-                        SELECT url_id, status_code, response_time, is_up, 
-                               error_message, checked_at,
-                               ROW_NUMBER() OVER (PARTITION BY url_id ORDER BY checked_at DESC) as rn
-                        FROM url_checks
-                    ) latest ON u.id = latest.url_id AND latest.rn = 1
-                    ORDER BY u.created_at
-                """)
+            with self.get_cursor(raw=True) as cursor:
+                cursor.arraysize = _FETCH_SIZE
+                cursor.execute(_SELECT_ALL_STATUS)
                 
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+                rows = cursor.fetchmany()
+                while rows:
+                    yield from map(StatusRow._make, rows)
+                    rows = cursor.fetchmany()
                 
         except Exception as e:
-            logger.error(f"Failed to get all status: {e}")
-            return []
+            logger.error("Failed to get all status: %s", e)
+    
+    def get_all_status(self) -> List[Dict[str, Any]]:
+        """Get current status of all URLs"""
+        return [row._asdict() for row in self.iter_all_status()]
     
     def get_url_history(self, url_id: int, days: int = 7, limit: int = 100) -> List[Dict[str, Any]]:
         """Get check history for a URL"""
         try:
             with self.get_cursor() as cursor:
-                since_date = datetime.now() - timedelta(days=days)
+                since_iso = _days_ago_iso(days)
                 
                 cursor.execute("""
                     SELECT * FROM url_checks 
                     WHERE url_id = ? AND checked_at >= ?
-                    ORDER BY checked_at DESC
+                    ORDER BY checked_at DESC, id DESC
                     LIMIT ?
-                """, (url_id, since_date, limit))
+                """, (url_id, since_iso, limit))
                 
                 rows = cursor.fetchall()
                 return [dict(row) for row in rows]
                 
         except Exception as e:
-            logger.error(f"Failed to get URL history {url_id}: {e}")
+            logger.error("Failed to get URL history %s: %s", url_id, e)
             return []
     
+    def get_latest_check_id(self, url_id: int) -> Optional[int]:
+        """Get the ID of the most recent check for a URL (changes whenever a check is saved)"""
+        try:
+            with self.get_cursor() as cursor:
+                cursor.execute("SELECT MAX(id) FROM url_checks WHERE url_id = ?", (url_id,))
+                return cursor.fetchone()[0]
+                
+        except Exception as e:
+            logger.error("Failed to get latest check for URL %s: %s", url_id, e)
+            return None
+    
     def get_uptime_stats(self, url_id: int, days: int = 30) -> Dict[str, Any]:
         """Calculate uptime statistics for a URL"""
         try:
-            with self.get_cursor() as cursor:
-                since_date = datetime.now() - timedelta(days=days)
+            with self.get_cursor(raw=True) as cursor:
+                since_iso = _days_ago_iso(days)
                 
                 cursor.execute("""
                     SELECT 
@@ -417,19 +626,19 @@ class DatabaseManager:
                         MAX(CASE WHEN is_up AND response_time IS NOT NULL THEN response_time END) as max_response_time
                     FROM url_checks
                     WHERE url_id = ? AND checked_at >= ?
-                """, (url_id, since_date))
+                """, (url_id, since_iso))
                 
-                row = cursor.fetchone()
-                if row and row['total_checks'] > 0:
-                    uptime_percentage = (row['up_checks'] / row['total_checks']) * 100
+                total_checks, up_checks, avg_response_time, min_response_time, max_response_time = cursor.fetchone()
+                if total_checks > 0:
+                    uptime_percentage = (up_checks / total_checks) * 100
                     return {
-                        'total_checks': row['total_checks'],
-                        'up_checks': row['up_checks'],
-                        'down_checks': row['total_checks'] - row['up_checks'],
+                        'total_checks': total_checks,
+                        'up_checks': up_checks,
+                        'down_checks': total_checks - up_checks,
                         'uptime_percentage': round(uptime_percentage, 2),
-                        'avg_response_time': round(row['avg_response_time'] or 0, 2),
-                        'min_response_time': row['min_response_time'],
-                        'max_response_time': row['max_response_time'],
+                        'avg_response_time': round(avg_response_time or 0, 2),
+                        'min_response_time': min_response_time,
+                        'max_response_time': max_response_time,
                         'period_days': days
                     }
                 
@@ -445,7 +654,7 @@ class DatabaseManager:
                 }
                 
         except Exception as e:
-            logger.error(f"Failed to get uptime stats for URL {url_id}: {e}")
+            logger.error("Failed to get uptime stats for URL %s: %s", url_id, e)
             return {}
 
 # In app/database.py, replace the existing cleanup_old_records function with this one:
@@ -456,55 +665,94 @@ class DatabaseManager:
         deleted_count = 0
         
         try:
-            # First, delete old records within a transaction for safety
-            with self.get_cursor() as cursor:
-                cutoff_date = datetime.now() - timedelta(days=retention_days)
+            cutoff_iso = _days_ago_iso(retention_days)
+            
+            # Delete old records in bounded batches, one transaction each, so
+            # the WAL stays small and checks can be written in between
+            while True:
+                with self.get_cursor() as cursor:
+                    cursor.execute("""
+                        DELETE FROM url_checks 
+                        WHERE rowid IN (
+                            SELECT rowid FROM url_checks
+                            WHERE checked_at < ?
+                            ORDER BY checked_at
+                            LIMIT ?
+                        )
+                    """, (cutoff_iso, _CLEANUP_BATCH_SIZE))
+                    batch_count = cursor.rowcount
                 
+                deleted_count += batch_count
+                if batch_count < _CLEANUP_BATCH_SIZE:
+                    break
+            
+            if deleted_count > 0:
+                logger.info("Cleaned up %s old check records", deleted_count)
+            
+            with self.get_cursor() as cursor:
+                # Remember when cleanup last ran so callers can throttle it
                 cursor.execute("""
-                    DELETE FROM url_checks 
-                    WHERE checked_at < ?
-                """, (cutoff_date,))
-                
-                deleted_count = cursor.rowcount
-                if deleted_count > 0:
-                    logger.info(f"Cleaned up {deleted_count} old check records")
+                    INSERT OR REPLACE INTO system_info (key, value, updated_at)
+                    VALUES ('last_cleanup', ?, CURRENT_TIMESTAMP)
+                """, (str(time.time()),))
             
-            # After the transaction is committed, run VACUUM on the connection
-            # We only vacuum if something was actually deleted
+            # After the delete is committed, reclaim free pages incrementally
+            # instead of rewriting the whole file with VACUUM
             if deleted_count > 0:
-                logger.info("Vacuuming database to reclaim space...")
-                self.connection.execute("VACUUM")
-                logger.info("Database vacuum complete.")
+                # executescript steps the pragma to completion; execute() would
+                # free only a single page
+                with self.get_connection() as conn:
+                    conn.executescript("PRAGMA incremental_vacuum(1000)")
+                self.optimize()
 
             return deleted_count
             
         except Exception as e:
-            logger.error(f"Failed to cleanup old records: {e}")
+            logger.error("Failed to cleanup old records: %s", e)
             # Ensure we return 0 if the delete part failed
             return 0
 
+    def get_last_cleanup_time(self) -> float:
+        """Get the Unix time of the last successful cleanup (0 if it never ran)"""
+        try:
+            with self.get_cursor() as cursor:
+                cursor.execute("SELECT value FROM system_info WHERE key = 'last_cleanup'")
+                row = cursor.fetchone()
+                return float(row[0]) if row else 0.0
+                
+        except Exception as e:
+            logger.error("Failed to get last cleanup time: %s", e)
+            return 0.0
+    
+    def optimize(self) -> bool:
+        """Refresh query planner statistics so the indexes are chosen correctly"""
+        try:
+            with self.get_connection() as conn:
+                conn.execute("ANALYZE")
+                conn.execute("PRAGMA optimize")
+                conn.commit()
+            return True
+            
+        except Exception as e:
+            logger.error("Failed to optimize database: %s", e)
+            return False
+    
     def get_database_stats(self) -> Dict[str, Any]:
         """Get database statistics"""
         try:
             with self.get_cursor() as cursor:
                 stats = {}
                 
-                # Count tables
-                cursor.execute("SELECT COUNT(*) FROM urls")
-                stats['total_urls'] = cursor.fetchone()[0]
-                
-                cursor.execute("SELECT COUNT(*) FROM urls WHERE is_active = 1")
-                stats['active_urls'] = cursor.fetchone()[0]
+                # Count tables, one pass per table with conditional aggregates
+                cursor.execute("SELECT COUNT(*), COALESCE(SUM(is_active = 1), 0) FROM urls")
+                stats['total_urls'], stats['active_urls'] = cursor.fetchone()
                 
-                cursor.execute("SELECT COUNT(*) FROM url_checks")
-                stats['total_checks'] = cursor.fetchone()[0]
-                
-                # Recent activity
                 cursor.execute("""
-                    SELECT COUNT(*) FROM url_checks 
-                    WHERE checked_at >= datetime('now', '-24 hours')
+                    SELECT COUNT(*),
+                           COALESCE(SUM(checked_at >= datetime('now', '-24 hours')), 0)
+                    FROM url_checks
                 """)
-                stats['checks_last_24h'] = cursor.fetchone()[0]
+                stats['total_checks'], stats['checks_last_24h'] = cursor.fetchone()
                 
                 # Database file size
                 stats['db_file_size'] = Path(self.db_path).stat().st_size
@@ -519,27 +767,23 @@ class DatabaseManager:
                 return stats
                 
         except Exception as e:
-            logger.error(f"Failed to get database stats: {e}")
+            logger.error("Failed to get database stats: %s", e)
             return {}
     
-    def _row_to_url_record(self, row: sqlite3.Row) -> URLRecord:
-        """Convert database row to URLRecord"""
-        return URLRecord(
-            id=row['id'],
-            url=row['url'],
-            name=row['name'],
-            timeout=row['timeout'],
-            is_active=bool(row['is_active']),
-            created_at=datetime.fromisoformat(row['created_at']),
-            updated_at=datetime.fromisoformat(row['updated_at']),
-            last_checked=datetime.fromisoformat(row['last_checked']) if row['last_checked'] else None
-        )
+    def _row_to_url_record(self, row: Tuple) -> URLRecord:
+        """Convert a _URL_COLUMNS row to URLRecord"""
+        return URLRecord(*row)
     
     def close(self):
-        """Close database connections"""
-        if hasattr(self._local, 'connection') and self._local.connection:
-            self._local.connection.close()
-            self._local.connection = None
+        """Close idle pooled connections"""
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._pool_lock:
+                self._open_connections -= 1
     
     def __enter__(self):
         return self
@@ -6,27 +6,47 @@ Manages scheduled execution of URL checks.
 """
 
 import logging
+from datetime import timezone
+from functools import lru_cache
+from typing import Tuple
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
-from pytz import utc
 
 from app.config import get_config
 from app.checker import run_all_checks
+from app.database import get_database
 
 logger = logging.getLogger(__name__)
 
-def start_scheduler():
+UTC = timezone.utc
+
+# The running scheduler, so another thread can stop it (see stop_scheduler)
+_scheduler = None
+
+
+@lru_cache(maxsize=None)
+def _parse_schedule(schedule_time: str) -> Tuple[int, int]:
+    """Parse an "HH:MM" schedule string into (hour, minute)."""
+    hour, minute = schedule_time.split(':')
+    return int(hour), int(minute)
+
+
+def start_scheduler(session=None):
     """
     Initializes and starts the scheduler based on settings from config.
+    
+    An optional requests session (see app.checker.create_session) is reused
+    by every check run, keeping connections alive between cycles.
     """
+    global _scheduler
     config = get_config()
     
     if not config.get('scheduler.enabled', True):
         logger.info("Scheduler is disabled in configuration.")
         return
 
-    scheduler = BlockingScheduler(timezone=utc)
-    schedules = config.get('scheduler.schedules', ["06:00", "14:00", "20:00"])
+    scheduler = BlockingScheduler(timezone=UTC)
+    schedules = tuple(config.get('scheduler.schedules', ["06:00", "14:00", "20:00"]) or ())
     
     if not schedules:
         logger.warning("No schedules found in configuration. Scheduler will not run.")
@@ -35,28 +55,50 @@ def start_scheduler():
     logger.info("Configuring scheduler...")
     for i, schedule_time in enumerate(schedules):
         try:
-            hour, minute = map(int, schedule_time.split(':'))
-            trigger = CronTrigger(hour=hour, minute=minute, timezone=utc)
+            hour, minute = _parse_schedule(schedule_time)
+            trigger = CronTrigger(hour=hour, minute=minute, timezone=UTC)
             scheduler.add_job(
                 run_all_checks,
                 trigger=trigger,
+                kwargs={'session': session},
                 id=f'url_check_job_{i}',
                 name=f'URL Check at {schedule_time} UTC',
                 replace_existing=True
             )
-            logger.info(f"Scheduled job to run daily at {schedule_time} UTC.")
-        except (ValueError, TypeError) as e:
-            logger.error(f"Invalid schedule format '{schedule_time}'. Skipping. Error: {e}")
+            logger.info("Scheduled job to run daily at %s UTC.", schedule_time)
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.error("Invalid schedule format '%s'. Skipping. Error: %s", schedule_time, e)
 
     if not scheduler.get_jobs():
         logger.error("No valid jobs were scheduled. Exiting scheduler.")
         return
+
+    # Keep planner statistics fresh even when automatic cleanup is disabled
+    scheduler.add_job(
+        get_database().optimize,
+        trigger=CronTrigger(hour=0, minute=30, timezone=UTC),
+        id='db_optimize_job',
+        name='Database optimize at 00:30 UTC',
+        replace_existing=True
+    )
         
     try:
         logger.info("Scheduler started. Press Ctrl+C to exit.")
+        _scheduler = scheduler
         scheduler.start()
     except (KeyboardInterrupt, SystemExit):
         logger.info("Scheduler stopped.")
     finally:
+        _scheduler = None
         if scheduler.running:
-            scheduler.shutdown()
\ No newline at end of file
+            scheduler.shutdown()
+
+
+def stop_scheduler():
+    """
+    Stops a scheduler started by start_scheduler() on another thread, making
+    its start_scheduler() call return.
+    """
+    scheduler = _scheduler
+    if scheduler is not None and scheduler.running:
+        scheduler.shutdown(wait=False)
\ No newline at end of file
@@ -5,39 +5,90 @@ Command-line interface and application bootstrapping
 """
 
 import sys
+
+# Answer --version before anything else is imported or set up
+if __name__ == '__main__' and sys.argv[1:2] in (['--version'], ['-V']):
+    from app import __version__
+    print(f"URL Monitor v{__version__}")
+    sys.exit(0)
+
 import os
-import argparse
 import logging
-import threading
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime
+from urllib.parse import urlsplit
+
+from app import __version__
+
+# Config, database, checker, scheduler and dashboard (requests, APScheduler,
+# Flask) are imported inside the commands that use them, so --help and
+# --version stay fast
+
+
+# Directories already created by this process (see _ensure_dir)
+_ensured_dirs = set()
 
-# Add app directory to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app import get_config, get_database, __version__
-from app.config import create_default_config
-from app.checker import run_all_checks
-from app.scheduler import start_scheduler
-from app.dashboard import create_app
+def _ensure_dir(path):
+    """Create a directory (and parents) once per process"""
+    key = str(path)
+    if key in _ensured_dirs:
+        return
+    Path(key).mkdir(parents=True, exist_ok=True)
+    _ensured_dirs.add(key)
 
 
-def setup_logging():
-    """Setup application logging"""
+# Drains queued log records in background mode (kept referenced until exit)
+_log_listener = None
+
+
+def setup_logging(background=False):
+    """
+    Setup application logging.
+    
+    With background=True (long-running scheduler/dashboard modes) records are
+    only enqueued by the logging thread and a QueueListener thread does the
+    formatting and file/console writes.
+    """
+    from app import get_config
+    
+    global _log_listener
     config = get_config()
     log_level = getattr(logging, config.get('logging.level', 'INFO').upper())
     log_format = config.get('logging.format')
     
     log_file = config.get('logging.file', 'logs/monitor.log')
-    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(Path(log_file).parent)
+    
+    handlers = [
+        logging.FileHandler(log_file),
+        logging.StreamHandler(sys.stdout)
+    ]
+    
+    if background and _log_listener is None:
+        import atexit
+        import queue
+        from logging.handlers import QueueHandler, QueueListener
+        
+        formatter = logging.Formatter(log_format)
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        log_queue = queue.Queue(-1)
+        _log_listener = QueueListener(log_queue, *handlers)
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+        
+        # The listener's handlers apply the real format; the queue side keeps
+        # just the message so it isn't formatted twice
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        handlers = [queue_handler]
     
     logging.basicConfig(
         level=log_level,
         format=log_format,
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler(sys.stdout)
-        ]
+        handlers=handlers
     )
     
     # Silence noisy libraries
@@ -48,39 +99,38 @@ def setup_logging():
     return logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1024)
 def validate_url(url):
-    """Basic URL validation"""
-    import re
-    pattern = re.compile(
-        r'^https?://'
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'
-        r'localhost|'
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'
-        r'(?::\d+)?'
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE
-    )
-    return bool(pattern.match(url))
+    """Basic URL validation: an http(s) scheme and a host"""
+    try:
+        parts = urlsplit(url)
+    except ValueError:  # e.g. a malformed IPv6 literal
+        return False
+    return parts.scheme in ('http', 'https') and bool(parts.hostname)
 
 
 def cmd_init(args):
     """Initialize the application"""
+    from app import get_config, get_database
+    from app.config import create_default_config
+    
     logger = setup_logging()
     
     try:
-        config_file = get_config().config_file
+        config = get_config()
+        config_file = config.config_file
         if not Path(config_file).exists() or args.force:
             if create_default_config(config_file):
-                logger.info(f"Created configuration: {config_file}")
+                logger.info("Created configuration: %s", config_file)
             else:
-                logger.error(f"Failed to create config: {config_file}")
+                logger.error("Failed to create config: %s", config_file)
                 return 1
         
         db = get_database()
         if db.initialize():
             logger.info("Database initialized")
-            config = get_config() # Re-read config in case it was just created
-            Path(config.get('logging.file')).parent.mkdir(parents=True, exist_ok=True)
-            Path(config.get('database.path')).parent.mkdir(parents=True, exist_ok=True)
+            _ensure_dir(Path(config.get('logging.file')).parent)
+            _ensure_dir(Path(config.get('database.path')).parent)
             
             print("✓ URL Monitor initialized successfully.")
             print(f"  Config:   {config_file}")
@@ -95,16 +145,18 @@ def cmd_init(args):
             return 1
             
     except Exception as e:
-        logger.error(f"Initialization error: {e}", exc_info=True)
+        logger.error("Initialization error: %s", e, exc_info=True)
         print(f"Error: {e}")
         return 1
 
 
 def cmd_add_url(args):
     """Add URL to monitoring"""
+    from app import get_database
+    
     logger = setup_logging()
     
-    url = args.url.strip()
+    url = args.add_url.strip()
     if not validate_url(url):
         print(f"Error: Invalid URL format provided: {url}")
         return 1
@@ -123,14 +175,66 @@ def cmd_add_url(args):
             return 1
             
     except Exception as e:
-        logger.error(f"Error adding URL: {e}", exc_info=True)
+        logger.error("Error adding URL: %s", e, exc_info=True)
+        print(f"Error: {e}")
+        return 1
+
+
+def cmd_add_urls_file(args):
+    """Add every URL listed in a file (one per line) to monitoring"""
+    from app import get_database
+    
+    logger = setup_logging()
+    
+    try:
+        with open(args.add_urls_file, encoding='utf-8') as f:
+            lines = [line.strip() for line in f]
+    except OSError as e:
+        print(f"Error: Cannot read URL file: {e}")
+        return 1
+    
+    urls = []
+    for line in lines:
+        if not line or line.startswith('#'):
+            continue
+        if validate_url(line):
+            urls.append(line)
+        else:
+            print(f"Skipping invalid URL: {line}")
+    
+    if not urls:
+        print("No valid URLs found in file.")
+        return 1
+    
+    # Lines repeated in the file are skipped here, not counted as monitored
+    unique_urls = list(dict.fromkeys(urls))
+    duplicates = len(urls) - len(unique_urls)
+    
+    try:
+        db = get_database()
+        added_count = db.add_urls_bulk(unique_urls, args.timeout, args.active)
+        if added_count is None:
+            print("Error: Failed to add URLs to the database")
+            return 1
+        
+        summary = f"✓ Added {added_count} URLs ({len(unique_urls) - added_count} already monitored"
+        if duplicates:
+            summary += f", {duplicates} duplicate lines skipped"
+        print(summary + ")")
+        return 0
+        
+    except Exception as e:
+        logger.error("Error adding URLs: %s", e, exc_info=True)
         print(f"Error: {e}")
         return 1
 
 
 def cmd_list_urls(args):
     """List all URLs"""
-    setup_logging()
+    from app import get_database
+    
+    # Read-only: no log file or handlers, just a logger for the error path
+    logger = logging.getLogger(__name__)
     
     try:
         db = get_database()
@@ -143,30 +247,35 @@ def cmd_list_urls(args):
         if args.format == 'JSON':
             import json
             url_data = [{'id': u.id, 'url': u.url, 'name': u.name, 'active': u.is_active, 'timeout': u.timeout} for u in urls]
-            print(json.dumps(url_data, indent=2))
+            json.dump(url_data, sys.stdout, indent=2)
+            sys.stdout.write('\n')
         else:
-            print(f"\n--- {'Active' if args.active_only else 'All'} Monitored URLs ---")
+            # Build the whole table and write it in one call
+            lines = [f"\n--- {'Active' if args.active_only else 'All'} Monitored URLs ---"]
             for url in urls:
                 status = "✓ Active" if url.is_active else "✗ Inactive"
                 name = f" ({url.name})" if url.name else ""
-                print(f"[{url.id: >3}] {status:<10} | {url.url}{name}")
-            print(f"--------------------------\nTotal: {len(urls)}")
+                lines.append(f"[{url.id: >3}] {status:<10} | {url.url}{name}")
+            lines.append(f"--------------------------\nTotal: {len(urls)}\n")
+            sys.stdout.write('\n'.join(lines))
         
         return 0
         
     except Exception as e:
-        logger.error(f"Error listing URLs: {e}", exc_info=True)
+        logger.error("Error listing URLs: %s", e, exc_info=True)
         print(f"Error: {e}")
         return 1
 
 
 def cmd_remove_url(args):
     """Remove URL from monitoring"""
+    from app import get_database
+    
     logger = setup_logging()
     
     try:
         db = get_database()
-        url_input = args.url.strip()
+        url_input = args.remove_url.strip()
         
         try:
             url_id = int(url_input)
@@ -188,14 +297,34 @@ def cmd_remove_url(args):
             return 1
             
     except Exception as e:
-        logger.error(f"Error removing URL: {e}", exc_info=True)
+        logger.error("Error removing URL: %s", e, exc_info=True)
         print(f"Error: {e}")
         return 1
 
 
+# Status report row templates, bound once so each row is a single format call
+_ROW_UP = "✓ UP     | {url:<60} | {rt:>8.2f}ms".format_map
+_ROW_DOWN = "✗ DOWN   | {url:<60} | {err:>20}".format_map
+_ROW_PENDING = "? PEND   | {url:<60} | {err:>20}".format_map
+
+
+def _write_report(text):
+    """Write a report to stdout, bypassing the text layer when it is UTF-8"""
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if buffer is not None and (sys.stdout.encoding or '').lower() in ('utf-8', 'utf8'):
+        sys.stdout.flush()
+        buffer.write(text.encode('utf-8'))
+        buffer.flush()
+    else:
+        sys.stdout.write(text)
+
+
 def cmd_status(args):
     """Show URL status"""
-    setup_logging()
+    from app import get_database
+    
+    # Read-only: no log file or handlers, just a logger for the error path
+    logger = logging.getLogger(__name__)
     
     try:
         db = get_database()
@@ -207,46 +336,95 @@ def cmd_status(args):
         
         if args.format == 'JSON':
             import json
-            print(json.dumps(all_status, indent=2, default=str))
+            # Stream straight to stdout instead of building the whole string
+            json.dump(all_status, sys.stdout, indent=2, default=str)
+            sys.stdout.write('\n')
         else:
-            print(f"\n--- Status Report - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---")
+            from datetime import datetime
+            # Build the whole report and write it in one call
+            lines = [f"\n--- Status Report - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---"]
             for status in all_status:
                 if not args.show_all and not status.get('is_active'):
                     continue
                 
-                url = status['url'][:60].ljust(60)
+                url = status['url'][:60]
                 if status.get('is_up'):
-                    resp_time = f"{status['response_time']:.2f}ms".rjust(10)
-                    print(f"✓ UP     | {url} | {resp_time}")
+                    lines.append(_ROW_UP({'url': url, 'rt': status['response_time']}))
                 elif status.get('checked_at'):
-                    error = (status.get('error_message') or 'Unknown Error')[:20].rjust(20)
-                    print(f"✗ DOWN   | {url} | {error}")
+                    lines.append(_ROW_DOWN({'url': url, 'err': (status.get('error_message') or 'Unknown Error')[:20]}))
                 else:
-                    print(f"? PEND   | {url} | {'Not checked yet'.rjust(20)}")
-            print("--------------------------------------------------")
+                    lines.append(_ROW_PENDING({'url': url, 'err': 'Not checked yet'}))
+            lines.append("--------------------------------------------------\n")
+            _write_report('\n'.join(lines))
         
         return 0
         
     except Exception as e:
-        logger.error(f"Error getting status: {e}", exc_info=True)
+        logger.error("Error getting status: %s", e, exc_info=True)
         print(f"Error: {e}")
         return 1
 
 def cmd_run_check(args):
     """Manually trigger a check of all active URLs"""
+    from app.checker import run_all_checks
+    
     logger = setup_logging()
     print("Starting manual check of all active URLs...")
     checked_count = run_all_checks()
     print(f"✓ Check complete. {checked_count} URLs were processed.")
     return 0
 
-def main():
-    """Main entry point"""
+
+def cmd_schedule(args):
+    """Run the check scheduler in the foreground"""
+    from app.checker import create_session
+    from app.scheduler import start_scheduler
+    
+    setup_logging(background=True)
+    # One pooled session for the scheduler's whole lifetime
+    return start_scheduler(session=create_session())
+
+
+def cmd_dashboard(args):
+    """Serve the web dashboard"""
+    from app import get_config
+    from app.dashboard import create_app
+    
+    setup_logging(background=True)
+    app = create_app()
+    config = get_config()
+    app.run(host=config.get('dashboard.host'), port=config.get('dashboard.port'), debug=config.get('dashboard.debug'))
+    return 0
+
+
+# Single-action commands keyed by argument name, checked in this order
+ACTIONS = {
+    'init': cmd_init,
+    'add_url': cmd_add_url,
+    'add_urls_file': cmd_add_urls_file,
+    'list_urls': cmd_list_urls,
+    'remove_url': cmd_remove_url,
+    'status': cmd_status,
+    'run_check': cmd_run_check,
+    'schedule': cmd_schedule,
+    'dashboard': cmd_dashboard,
+}
+
+def _log_scheduler_exit(future):
+    """Report an exception that ended the background scheduler"""
+    if not future.cancelled() and future.exception() is not None:
+        logging.error("Scheduler stopped with an error", exc_info=future.exception())
+
+
+def _build_parser():
+    """Build the full argparse parser (used for --help, errors and unusual input)"""
+    import argparse
+    
     parser = argparse.ArgumentParser(description=f"URL Monitor v{__version__}")
     
     # Global options
     parser.add_argument('--config', help='Path to custom config file')
-    parser.add_argument('--version', action='version', version=f"URL Monitor v{__version__}")
+    parser.add_argument('-V', '--version', action='version', version=f"URL Monitor v{__version__}")
     
     # Sub-commands (emulated with argument groups)
     action_group = parser.add_argument_group('actions')
@@ -254,6 +432,7 @@ def main():
     action_group.add_argument('--force', action='store_true', help='Force re-initialization, overwriting existing config')
     
     action_group.add_argument('--add-url', metavar='URL', help='Add a new URL to monitor')
+    action_group.add_argument('--add-urls-file', metavar='FILE', help='Add every URL listed in FILE (one per line)')
     action_group.add_argument('--list-urls', action='store_true', help='List all monitored URLs')
     action_group.add_argument('--remove-url', metavar='ID_OR_URL', help='Remove a URL by its ID or full address')
     
@@ -273,46 +452,112 @@ def main():
     display_group.add_argument('--active-only', action='store_true', help='Show only active URLs when listing')
     display_group.add_argument('--show-all', action='store_true', help='Show inactive URLs in status report')
     display_group.add_argument('--format', choices=['TABLE', 'JSON'], default='TABLE', help='Output format for lists and status')
+    
+    return parser
+
+
+# Fast-path argument table for _parse_args; mirrors _build_parser
+_ARG_DEFAULTS = {
+    'config': None, 'init': False, 'force': False,
+    'add_url': None, 'add_urls_file': None, 'list_urls': False, 'remove_url': None,
+    'status': False, 'run_check': False, 'schedule': False, 'dashboard': False,
+    'name': None, 'timeout': 10, 'active': True,
+    'active_only': False, 'show_all': False, 'format': 'TABLE',
+}
+_FLAG_ARGS = {
+    '--init': 'init', '--force': 'force', '--list-urls': 'list_urls',
+    '--status': 'status', '--run-check': 'run_check', '--schedule': 'schedule',
+    '--dashboard': 'dashboard', '--active': 'active',
+    '--active-only': 'active_only', '--show-all': 'show_all',
+}
+_VALUE_ARGS = {
+    '--config': 'config', '--add-url': 'add_url', '--add-urls-file': 'add_urls_file',
+    '--remove-url': 'remove_url', '--name': 'name', '--timeout': 'timeout', '--format': 'format',
+}
+
+
+def _parse_args(argv):
+    """
+    Parse the command line without argparse for the common cases.
+    
+    Anything the fast path doesn't handle exactly (--help, --version, unknown
+    or abbreviated options, --opt=value, bad values) is handed to the full
+    argparse parser so its help text and error messages are unchanged.
+    """
+    from types import SimpleNamespace
+    
+    values = dict(_ARG_DEFAULTS)
+    i = 0
+    try:
+        while i < len(argv):
+            arg = argv[i]
+            if arg in _FLAG_ARGS:
+                values[_FLAG_ARGS[arg]] = True
+                i += 1
+            elif arg in _VALUE_ARGS and i + 1 < len(argv) and not argv[i + 1].startswith('-'):
+                values[_VALUE_ARGS[arg]] = argv[i + 1]
+                i += 2
+            else:
+                raise ValueError(arg)
+        
+        values['timeout'] = int(values['timeout'])
+        if values['format'] not in ('TABLE', 'JSON'):
+            raise ValueError(values['format'])
+    except ValueError:
+        return _build_parser().parse_args(argv)
+    
+    return SimpleNamespace(**values)
 
-    args = parser.parse_args()
+
+def main():
+    """Main entry point"""
+    args = _parse_args(sys.argv[1:])
+    
+    if not any(getattr(args, name, None) for name in ACTIONS):
+        _build_parser().print_help()
+        return 0
+    
+    # User-supplied files are relative to the caller's directory
+    if args.add_urls_file:
+        args.add_urls_file = os.path.abspath(args.add_urls_file)
+    
+    # Config, data and log paths are relative to the project root; only
+    # resolve and enter it once we know a command will actually run
+    os.chdir(Path(__file__).parent.resolve())
     
     # Handle combined dashboard and schedule command
     if args.dashboard and args.schedule:
-        setup_logging()
+        from concurrent.futures import ThreadPoolExecutor
+        from app import get_config
+        from app.checker import create_session
+        from app.scheduler import start_scheduler, stop_scheduler
+        from app.dashboard import create_app
+        
+        setup_logging(background=True)
         logging.info("Starting dashboard and scheduler in combined mode.")
-        scheduler_thread = threading.Thread(target=start_scheduler, daemon=True)
-        scheduler_thread.start()
         
-        app = create_app()
-        config = get_config()
-        app.run(host=config.get('dashboard.host'), port=config.get('dashboard.port'))
+        scheduler_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scheduler')
+        try:
+            # Under Flask's reloader this also runs in the serving child process
+            # (WERKZEUG_RUN_MAIN=true); only one process may run the scheduler
+            if os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
+                # One pooled session for the scheduler's whole lifetime
+                future = scheduler_pool.submit(start_scheduler, session=create_session())
+                future.add_done_callback(_log_scheduler_exit)
+            
+            app = create_app()
+            config = get_config()
+            app.run(host=config.get('dashboard.host'), port=config.get('dashboard.port'))
+        finally:
+            # Tie the scheduler to the web server's lifetime
+            stop_scheduler()
+            scheduler_pool.shutdown(wait=False)
         return 0
 
     # Handle single action commands
-    if args.init: return cmd_init(args)
-    if args.add_url:
-        args.url = args.add_url
-        return cmd_add_url(args)
-    if args.list_urls: return cmd_list_urls(args)
-    if args.remove_url:
-        args.url = args.remove_url
-        return cmd_remove_url(args)
-    if args.status: return cmd_status(args)
-    if args.run_check: return cmd_run_check(args)
-    if args.schedule:
-        setup_logging()
-        return start_scheduler()
-    if args.dashboard:
-        setup_logging()
-        app = create_app()
-        config = get_config()
-        app.run(host=config.get('dashboard.host'), port=config.get('dashboard.port'), debug=config.get('dashboard.debug'))
-        return 0
-
-    parser.print_help()
-    return 0
+    for name, command in ACTIONS.items():
+        if getattr(args, name, None):
+            return command(args)
 
 if __name__ == '__main__':
-    # Ensure we are in the project root directory
-    os.chdir(Path(__file__).parent.resolve())
     sys.exit(main())
\ No newline at end of file
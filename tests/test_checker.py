@@ -3,6 +3,7 @@ import pytest
 import requests
 import requests_mock
 from app.checker import check_single_url
+from app import checker
 from app.database import URLRecord
 from datetime import datetime
 
@@ -23,7 +24,7 @@ def mock_url_record():
 def test_check_successful_url(mock_url_record: URLRecord):
     """Tests a successful check for a URL that is up (200 OK)."""
     with requests_mock.Mocker() as m:
-        m.get(mock_url_record.url, text="OK", status_code=200)
+        m.head(mock_url_record.url, text="OK", status_code=200)
         
         result = check_single_url(mock_url_record)
         
@@ -36,7 +37,7 @@ def test_check_successful_url(mock_url_record: URLRecord):
 def test_check_failed_url(mock_url_record: URLRecord):
     """Tests a check for a URL that is down (503 Service Unavailable)."""
     with requests_mock.Mocker() as m:
-        m.get(mock_url_record.url, status_code=503)
+        m.head(mock_url_record.url, status_code=503)
         
         result = check_single_url(mock_url_record)
         
@@ -47,7 +48,7 @@ def test_check_failed_url(mock_url_record: URLRecord):
 def test_check_url_timeout(mock_url_record: URLRecord):
     """Tests a check that results in a connection timeout."""
     with requests_mock.Mocker() as m:
-        m.get(mock_url_record.url, exc=requests.exceptions.Timeout)
+        m.head(mock_url_record.url, exc=requests.exceptions.Timeout)
         
         result = check_single_url(mock_url_record)
         
@@ -58,9 +59,226 @@ def test_check_url_timeout(mock_url_record: URLRecord):
 def test_check_connection_error(mock_url_record: URLRecord):
     """Tests a check that results in a generic connection error."""
     with requests_mock.Mocker() as m:
-        m.get(mock_url_record.url, exc=requests.exceptions.ConnectionError)
+        m.head(mock_url_record.url, exc=requests.exceptions.ConnectionError)
         
         result = check_single_url(mock_url_record)
         
         assert result['is_up'] is False
-        assert "Connection error: ConnectionError" in result['error_message']
\ No newline at end of file
+        assert "Connection error: ConnectionError" in result['error_message']
+
+def test_check_falls_back_to_get(mock_url_record: URLRecord):
+    """Tests that a URL rejecting HEAD (405) is re-checked with GET."""
+    with requests_mock.Mocker() as m:
+        m.head(mock_url_record.url, status_code=405)
+        m.get(mock_url_record.url, text="OK", status_code=200)
+        
+        result = check_single_url(mock_url_record)
+        
+        assert [r.method for r in m.request_history] == ['HEAD', 'GET']
+        assert result['is_up'] is True
+        assert result['status_code'] == 200
+
+def test_check_with_get_method(mock_url_record: URLRecord, monkeypatch):
+    """Tests that checker.method = GET skips HEAD and streams the GET."""
+    monkeypatch.setattr(checker, '_METHOD', 'GET')
+    with requests_mock.Mocker() as m:
+        m.get(mock_url_record.url, text="OK", status_code=200)
+        
+        result = check_single_url(mock_url_record)
+        
+        assert [r.method for r in m.request_history] == ['GET']
+        assert m.request_history[0].stream is True
+        assert result['is_up'] is True
+
+def test_threaded_checks_grouped_by_host(mock_url_record: URLRecord):
+    """Tests that every URL is checked when several share a host."""
+    from app.checker import _check_urls_threaded
+    urls = [
+        mock_url_record,
+        URLRecord(**{**mock_url_record.__dict__, 'id': 2, 'url': "https://test.com/health"}),
+        URLRecord(**{**mock_url_record.__dict__, 'id': 3, 'url': "https://other.com"}),
+    ]
+    with requests_mock.Mocker() as m:
+        m.head(requests_mock.ANY, status_code=200)
+        
+        results = _check_urls_threaded(urls, max_workers=2, deadline=10)
+        
+        assert sorted(r['url_id'] for r in results) == [1, 2, 3]
+        assert all(r['is_up'] for r in results)
+
+def test_threaded_checks_cycle_deadline(mock_url_record: URLRecord, monkeypatch):
+    """Tests that URLs of a host still running at the cycle deadline are recorded as down."""
+    import time
+    slow = URLRecord(**{**mock_url_record.__dict__, 'id': 2, 'url': "https://slow.com"})
+    queued = URLRecord(**{**mock_url_record.__dict__, 'id': 3, 'url': "https://slow.com/health"})
+
+    def fake_check(url_record, session=None):
+        if url_record is slow:
+            time.sleep(1)
+        return {'url_id': url_record.id, 'is_up': True, 'status_code': 200,
+                'response_time': 1.0, 'error_message': None}
+
+    monkeypatch.setattr(checker, 'check_single_url', fake_check)
+    results = {r['url_id']: r for r in checker._check_urls_threaded([mock_url_record, slow, queued], max_workers=2, deadline=0.5)}
+    
+    assert results[1]['is_up'] is True
+    assert 2 not in results  # still in flight: outcome unknown
+    assert results[3]['is_up'] is False
+    assert results[3]['error_message'] == "Check cycle deadline exceeded"
+
+def test_cycle_deadline_keeps_completed_checks(mock_url_record: URLRecord, monkeypatch):
+    """Tests that a host group hitting the deadline keeps its finished checks and only marks unattempted URLs down."""
+    import time
+    urls = [URLRecord(**{**mock_url_record.__dict__, 'id': i, 'url': f"https://test.com/{i}"}) for i in range(1, 6)]
+
+    def slow_check(url_record, session=None):
+        time.sleep(0.3)
+        return {'url_id': url_record.id, 'is_up': True, 'status_code': 200,
+                'response_time': 300.0, 'error_message': None}
+
+    monkeypatch.setattr(checker, 'check_single_url', slow_check)
+    results = checker._check_urls_threaded(urls, max_workers=2, deadline=1.0)
+    
+    up = [r['url_id'] for r in results if r['is_up']]
+    down = [r['url_id'] for r in results if not r['is_up']]
+    assert up and up == list(range(1, len(up) + 1))
+    # The check in flight at the deadline is dropped, later URLs are marked down
+    assert down == list(range(len(up) + 2, 6))
+    assert all(r['error_message'] == "Check cycle deadline exceeded" for r in results if not r['is_up'])
+
+def test_cycle_deadline_keeps_groups_finished_at_the_deadline(mock_url_record: URLRecord, monkeypatch):
+    """Tests that a group finishing after as_completed's last yield but before its timeout is still saved."""
+    from concurrent.futures import TimeoutError as FuturesTimeoutError, wait
+    urls = [mock_url_record, URLRecord(**{**mock_url_record.__dict__, 'id': 2, 'url': "https://other.com"})]
+
+    def late_as_completed(futures, timeout=None):
+        wait(futures)
+        raise FuturesTimeoutError()
+        yield
+
+    monkeypatch.setattr(checker, 'as_completed', late_as_completed)
+    monkeypatch.setattr(checker, 'check_single_url', lambda url_record, session=None: {
+        'url_id': url_record.id, 'is_up': True, 'status_code': 200, 'response_time': 1.0, 'error_message': None})
+    results = checker._check_urls_threaded(urls, max_workers=2, deadline=1.0)
+    
+    assert sorted(r['url_id'] for r in results) == [1, 2]
+    assert all(r['is_up'] for r in results)
+
+def test_default_cycle_deadline_covers_retries(mock_url_record: URLRecord):
+    """Tests that the default deadline allows every URL of the largest group its retries and backoff."""
+    group = [URLRecord(**{**mock_url_record.__dict__, 'id': i, 'timeout': 10}) for i in range(3)]
+    retries = checker._CONFIG.get('checker.retry_attempts', 2)
+    delay = checker._CONFIG.get('checker.retry_delay', 3)
+    per_url = (retries + 1) * 10 + delay * (2 ** retries - 1)
+    
+    assert checker._default_cycle_deadline([group, group[:1]], max_workers=2) == 3 * per_url
+    assert checker._default_cycle_deadline([group, group[:1]], max_workers=1) == 2 * 3 * per_url
+
+def test_check_with_curl(mock_url_record: URLRecord, monkeypatch):
+    """Tests the pycurl backend against a local HTTP server."""
+    pytest.importorskip("pycurl")
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_HEAD(self):
+            self.send_response(405)
+            self.end_headers()
+
+        def do_GET(self):
+            self.send_response(200 if self.path == '/up' else 503)
+            self.end_headers()
+            self.wfile.write(b"x" * 65536)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(checker, '_BACKEND', 'pycurl')
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        up = check_single_url(URLRecord(**{**mock_url_record.__dict__, 'url': base + '/up'}))
+        down = check_single_url(URLRecord(**{**mock_url_record.__dict__, 'url': base + '/down'}))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert up['is_up'] is True
+    assert up['status_code'] == 200
+    assert down['is_up'] is False
+    assert "HTTP Status 503" in down['error_message']
+
+def test_session_reused_within_thread():
+    """Tests that checks on the same thread share one pooled session."""
+    from app.checker import _get_session
+    assert _get_session() is _get_session()
+
+def test_threaded_checks_use_shared_session(mock_url_record: URLRecord):
+    """Tests that a session passed to the threaded checker is used by every worker."""
+    session = checker.create_session()
+    with requests_mock.Mocker(session=session) as m:
+        m.head(mock_url_record.url, status_code=200)
+        results = checker._check_urls_threaded([mock_url_record], max_workers=2, deadline=5, session=session)
+    
+    assert results[0]['is_up'] is True
+    assert m.call_count == 1
+
+def test_check_single_url_async(mock_url_record: URLRecord):
+    """Tests the httpx backend, including the HEAD -> GET fallback."""
+    import asyncio
+    httpx = pytest.importorskip("httpx")
+    from app.checker import check_single_url_async
+
+    def handler(request):
+        if request.method == 'HEAD':
+            return httpx.Response(405)
+        return httpx.Response(200, text="OK")
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await check_single_url_async(client, mock_url_record)
+
+    result = asyncio.run(run())
+    assert result['is_up'] is True
+    assert result['status_code'] == 200
+    assert result['error_message'] is None
+
+def test_check_single_url_async_timeout(mock_url_record: URLRecord):
+    """Tests that an httpx timeout is reported like the threaded backend."""
+    import asyncio
+    httpx = pytest.importorskip("httpx")
+    from app.checker import check_single_url_async
+
+    def handler(request):
+        raise httpx.ConnectTimeout("timed out", request=request)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await check_single_url_async(client, mock_url_record)
+
+    result = asyncio.run(run())
+    assert result['is_up'] is False
+    assert "Request timed out" in result['error_message']
+
+def test_run_all_checks_follows_module_backend(monkeypatch):
+    """Tests that the cycle picks its backend from the same setting as check_single_url."""
+    from app.database import get_database, reset_database
+    db = get_database(db_path=":memory:")
+    try:
+        url_id = db.add_url("https://test.com")
+        checked = []
+
+        async def fake_async(urls_to_check):
+            checked.extend(u.id for u in urls_to_check)
+            return [{'url_id': url_id, 'is_up': True, 'status_code': 200,
+                     'response_time': 1.0, 'error_message': None}]
+
+        monkeypatch.setattr(checker, '_BACKEND', 'httpx')
+        monkeypatch.setattr(checker, 'check_urls_async', fake_async)
+        monkeypatch.setattr(checker, '_check_urls_threaded', lambda *args, **kwargs: pytest.fail("threaded path used"))
+        
+        assert checker.run_all_checks() == 1
+        assert checked == [url_id]
+    finally:
+        reset_database()
@@ -18,6 +18,13 @@ def test_load_from_file(temp_config_file):
     assert config.get('test_key') == 'test_value'
     assert config.get('nested.key') == 'nested_value'
 
+def test_cached_file_is_not_shared(temp_config_file):
+    """Tests that instances loaded from the same file don't share state."""
+    first = Config(config_file=temp_config_file)
+    first.set('nested.key', 'changed')
+    second = Config(config_file=temp_config_file)
+    assert second.get('nested.key') == 'nested_value'
+
 def test_default_config_creation():
     """Tests that a default config is created if no file exists."""
     config = Config(config_file='non_existent_file.json')
@@ -38,6 +45,15 @@ def test_set_value():
     config.set('new.nested.key', 'new_value')
     assert config.get('new.nested.key') == 'new_value'
 
+def test_cached_get_invalidated_on_change():
+    """Tests that cached lookups reflect later set() and update() calls."""
+    config = Config()
+    assert config.get('checker.user_agent') == 'URLMonitor/1.0'
+    config.set('checker.user_agent', 'Changed/1.0')
+    assert config.get('checker.user_agent') == 'Changed/1.0'
+    config.update({'checker': {'user_agent': 'Updated/1.0'}})
+    assert config.get('checker.user_agent') == 'Updated/1.0'
+
 def test_env_variable_override():
     """Tests that environment variables correctly override defaults."""
     os.environ['MONITOR_PORT'] = '9999'
@@ -64,4 +80,13 @@ def test_config_validation():
     config.set('dashboard.port', 99999)
     is_valid, errors = config.validate()
     assert is_valid is False
-    assert "dashboard.port must be between 1-65535" in errors[0]
\ No newline at end of file
+    assert "dashboard.port must be between 1-65535" in errors[0]
+
+def test_create_default_config(tmp_path):
+    """Tests that create_default_config writes the defaults to a new file."""
+    from app.config import create_default_config
+    output_file = tmp_path / "nested" / "config.json"
+    assert create_default_config(str(output_file)) is True
+    config = Config(config_file=str(output_file))
+    assert config.get('application.name') == 'URL Monitor'
+    assert config.get('scheduler.schedules') == ["06:00", "14:00", "20:00"]
@@ -0,0 +1,62 @@
+# FILE: tests/test_dashboard.py
+import pytest
+import app.dashboard as dashboard
+from app.dashboard import create_app
+from app.database import get_database, reset_database
+
+@pytest.fixture
+def client():
+    """Fixture to provide a test client backed by an in-memory database."""
+    db = get_database(db_path=":memory:")
+    db.add_url("https://dashboard-test.com")
+    dashboard._STATUS_CACHE = {'ts': 0.0, 'cycle_id': None, 'statuses': None, 'payload': None, 'etag': None}
+    dashboard._get_history_payload.cache_clear()
+    yield create_app().test_client()
+    reset_database()
+
+def test_api_status(client):
+    """Tests that /api/status returns every URL with an ETag."""
+    response = client.get('/api/status')
+    assert response.status_code == 200
+    assert response.headers['ETag']
+    assert [s['url'] for s in response.get_json()] == ["https://dashboard-test.com"]
+
+def test_api_status_not_modified(client):
+    """Tests that a matching If-None-Match is answered with 304."""
+    etag = client.get('/api/status').headers['ETag']
+    response = client.get('/api/status', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+
+def test_index_stats(client):
+    """Tests that the dashboard homepage renders the summary."""
+    response = client.get('/')
+    assert response.status_code == 200
+    assert b"dashboard-test.com" in response.data
+
+def test_api_history(client):
+    """Tests the history endpoint, including the unknown-URL case."""
+    response = client.get('/api/history/1')
+    assert response.status_code == 200
+    assert response.get_json() == {"url": "https://dashboard-test.com", "history": []}
+    assert client.get('/api/history/999').status_code == 404
+
+def test_api_history_refreshes_after_check(client):
+    """Tests that cached history is replaced once a new check is saved."""
+    first = client.get('/api/history/1')
+    assert client.get('/api/history/1', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+    
+    get_database().save_check_result(1, 200, 12.5, True)
+    
+    second = client.get('/api/history/1', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert len(second.get_json()['history']) == 1
+
+def test_api_history_window_moves_without_checks(client, monkeypatch):
+    """Tests that cached history is rebuilt when the 7-day window moves on, even with no new checks."""
+    first = client.get('/api/history/1')
+    
+    monkeypatch.setattr(dashboard, '_history_window', lambda: "2999-01-01 00")
+    second = client.get('/api/history/1', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert second.headers['ETag'] != first.headers['ETag']
+    assert dashboard._get_history_payload.cache_info().misses == 2
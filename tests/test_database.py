@@ -91,4 +91,328 @@ def test_save_and_get_status(db: DatabaseManager):
     assert status['is_up'] is False
     assert status['status_code'] == 500
     assert status['response_time'] == 5000.1
-    assert status['error_message'] == "Server Error"
\ No newline at end of file
+    assert status['error_message'] == "Server Error"
+
+def test_latest_status_breaks_timestamp_ties_by_id(db: DatabaseManager):
+    """Tests that the newest of several checks saved in the same second is reported."""
+    url_id = db.add_url("https://same-second.com")
+    with db.get_cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO url_checks (url_id, status_code, response_time, is_up, error_message, checked_at) "
+            "VALUES (?, ?, ?, ?, ?, '2024-01-01 00:00:00')",
+            [(url_id, 200, 10.0, True, None), (url_id, 503, 20.0, False, "HTTP Status 503")]
+        )
+    
+    assert db.get_url_status(url_id)['status_code'] == 503
+    assert db.get_all_status()[0]['status_code'] == 503
+    assert db.get_url_history(url_id, days=100000)[0]['status_code'] == 503
+
+def test_save_check_results_bulk(db: DatabaseManager):
+    """Tests saving several check results in one transaction."""
+    first_id = db.add_url("https://bulk-one.com")
+    second_id = db.add_url("https://bulk-two.com")
+    
+    saved = db.save_check_results_bulk([
+        {'url_id': first_id, 'status_code': 200, 'response_time': 10.0, 'is_up': True, 'error_message': None},
+        {'url_id': second_id, 'status_code': None, 'response_time': 5.0, 'is_up': False, 'error_message': "Request timed out"},
+    ])
+    
+    assert saved == 2
+    assert len(db.get_url_history(first_id)) == 1
+    assert db.get_url_history(second_id)[0]['error_message'] == "Request timed out"
+    assert db.get_url(first_id).last_checked is not None
+
+def test_cleanup_records_last_run(db: DatabaseManager):
+    """Tests that cleanup stores when it last ran."""
+    assert db.get_last_cleanup_time() == 0.0
+    db.cleanup_old_records(30)
+    assert db.get_last_cleanup_time() > 0
+
+def test_get_all_status(db: DatabaseManager):
+    """Tests that get_all_status pairs every URL with its latest check."""
+    checked_id = db.add_url("https://checked.com")
+    pending_id = db.add_url("https://pending.com")
+    with db.get_cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO url_checks (url_id, status_code, response_time, is_up, error_message, checked_at)
+            VALUES (?, 500, 10.0, 0, 'Server Error', '2024-01-01 00:00:00'),
+                   (?, 200, 20.0, 1, NULL, '2024-01-02 00:00:00')
+        """, (checked_id, checked_id))
+    
+    statuses = {s['id']: s for s in db.get_all_status()}
+    
+    assert statuses[checked_id]['status_code'] == 200
+    assert statuses[checked_id]['checked_at'] == '2024-01-02 00:00:00'
+    assert statuses[pending_id]['checked_at'] is None
+
+def test_optimize(db: DatabaseManager):
+    """Tests that optimize refreshes planner statistics."""
+    db.add_url("https://optimize.com")
+    assert db.optimize() is True
+    with db.get_cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM sqlite_stat1")
+        assert cursor.fetchone()[0] > 0
+
+def test_cleanup_reclaims_pages_incrementally(tmp_path):
+    """Tests that cleanup frees pages via incremental auto-vacuum."""
+    db = DatabaseManager(str(tmp_path / "vacuum.db"))
+    url_id = db.add_url("https://vacuum.com")
+    with db.get_cursor() as cursor:
+        cursor.executemany("""
+            INSERT INTO url_checks (url_id, is_up, error_message, checked_at)
+            VALUES (?, 0, ?, datetime('now', '-60 days'))
+        """, [(url_id, "x" * 500)] * 2000)
+    
+    with db.get_connection() as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    assert db.cleanup_old_records(30) == 2000
+    with db.get_connection() as conn:
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    db.close()
+
+def test_connection_pool_is_bounded(tmp_path):
+    """Tests that concurrent callers share a fixed set of pooled connections."""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    db = DatabaseManager(str(tmp_path / "pool.db"))
+    url_id = db.add_url("https://pool.com")
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        records = list(executor.map(lambda _: db.get_url(url_id), range(64)))
+    
+    assert all(r.url == "https://pool.com" for r in records)
+    assert db._pool.qsize() == db._pool_size
+    
+    # Closing drains the pool; the next caller reopens a connection
+    db.close()
+    assert db.get_url(url_id).url == "https://pool.com"
+    db.close()
+
+def test_get_database_stats(tmp_path):
+    """Tests the URL and check counters reported by get_database_stats."""
+    db = DatabaseManager(str(tmp_path / "stats.db"))
+    active_id = db.add_url("https://active.com")
+    db.add_url("https://inactive.com", active=False)
+    db.save_check_result(active_id, 200, 10.0, True)
+    with db.get_cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO url_checks (url_id, is_up, checked_at)
+            VALUES (?, 0, datetime('now', '-2 days'))
+        """, (active_id,))
+    
+    stats = db.get_database_stats()
+    
+    assert stats['total_urls'] == 2
+    assert stats['active_urls'] == 1
+    assert stats['total_checks'] == 2
+    assert stats['checks_last_24h'] == 1
+    db.close()
+
+def test_last_checked_migrates_to_view(tmp_path):
+    """Tests that a legacy urls.last_checked column is replaced by the urls_v view."""
+    import sqlite3
+    
+    path = str(tmp_path / "legacy.db")
+    legacy = sqlite3.connect(path)
+    legacy.execute("""
+        CREATE TABLE urls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT UNIQUE NOT NULL,
+            name TEXT,
+            timeout INTEGER DEFAULT 10,
+            is_active BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_checked TIMESTAMP
+        )
+    """)
+    legacy.execute("CREATE INDEX idx_urls_last_checked ON urls(last_checked)")
+    legacy.execute("INSERT INTO urls (url, last_checked) VALUES ('https://legacy.com', '2024-01-01 00:00:00')")
+    legacy.commit()
+    legacy.close()
+    
+    db = DatabaseManager(path)
+    with db.get_cursor() as cursor:
+        cursor.execute("PRAGMA table_info(urls)")
+        assert 'last_checked' not in {col['name'] for col in cursor.fetchall()}
+    
+    record = db.get_url_by_address("https://legacy.com")
+    assert record.last_checked is None
+    db.save_check_result(record.id, 200, 10.0, True)
+    assert db.get_url(record.id).last_checked is not None
+    db.close()
+
+def test_legacy_database_enables_incremental_vacuum(tmp_path):
+    """Tests that a database created without auto_vacuum is rebuilt in incremental mode."""
+    import sqlite3
+    
+    path = str(tmp_path / "legacy.db")
+    legacy = sqlite3.connect(path)
+    legacy.execute("CREATE TABLE legacy (id INTEGER PRIMARY KEY)")
+    legacy.commit()
+    assert legacy.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+    legacy.close()
+    
+    db = DatabaseManager(path)
+    with db.get_connection() as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2  # INCREMENTAL
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    db.close()
+
+def test_locked_vacuum_still_migrates_schema(tmp_path):
+    """Tests that a failed auto_vacuum rebuild doesn't stop the schema migration."""
+    import sqlite3
+    import threading
+    from app.config import get_config
+    
+    path = str(tmp_path / "locked.db")
+    legacy = sqlite3.connect(path)
+    legacy.execute("PRAGMA journal_mode = WAL")
+    legacy.execute("""
+        CREATE TABLE urls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT UNIQUE NOT NULL,
+            name TEXT,
+            timeout INTEGER DEFAULT 10,
+            is_active BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_checked TIMESTAMP
+        )
+    """)
+    legacy.execute("INSERT INTO urls (url) VALUES ('https://locked.com')")
+    legacy.commit()
+    legacy.close()
+    
+    # Hold the write lock past the VACUUM's busy timeout, then let the schema work through
+    writer = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    writer.execute("BEGIN IMMEDIATE")
+    release = threading.Timer(1.5, writer.execute, ("COMMIT",))
+    config = get_config()
+    original_timeout = config.get('database.connection_timeout', 30)
+    config.set('database.connection_timeout', 1)
+    try:
+        release.start()
+        db = DatabaseManager(path)
+    finally:
+        config.set('database.connection_timeout', original_timeout)
+        release.join()
+        writer.close()
+    
+    assert db._initialized
+    assert [u.url for u in db.list_urls()] == ["https://locked.com"]
+    with db.get_connection() as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0  # retried on a later start
+    db.close()
+
+def test_check_indexes(db: DatabaseManager):
+    """Tests that url_checks carries only the covering index for per-URL lookups."""
+    with db.get_cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'url_checks'")
+        assert {row['name'] for row in cursor.fetchall()} == {'idx_url_checks_stats_cov', 'idx_url_checks_cleanup'}
+        cursor.execute("EXPLAIN QUERY PLAN SELECT MAX(checked_at) FROM url_checks WHERE url_id = 1")
+        assert 'idx_url_checks_stats_cov' in cursor.fetchone()['detail']
+
+def test_get_uptime_stats(db: DatabaseManager):
+    """Tests uptime aggregation over a URL's recent checks."""
+    url_id = db.add_url("https://uptime.com")
+    assert db.get_uptime_stats(url_id)['total_checks'] == 0
+    
+    db.save_check_results_bulk([
+        {'url_id': url_id, 'status_code': 200, 'response_time': 10.0, 'is_up': True, 'error_message': None},
+        {'url_id': url_id, 'status_code': 200, 'response_time': 30.0, 'is_up': True, 'error_message': None},
+        {'url_id': url_id, 'status_code': 500, 'response_time': 99.0, 'is_up': False, 'error_message': 'HTTP 500'},
+    ])
+    stats = db.get_uptime_stats(url_id)
+    
+    assert stats['total_checks'] == 3
+    assert stats['down_checks'] == 1
+    assert stats['uptime_percentage'] == 66.67
+    assert stats['avg_response_time'] == 20.0
+    assert (stats['min_response_time'], stats['max_response_time']) == (10.0, 30.0)
+
+def test_cleanup_deletes_in_batches(db: DatabaseManager, monkeypatch):
+    """Tests that cleanup removes expired checks across several batches."""
+    from app import database
+    monkeypatch.setattr(database, "_CLEANUP_BATCH_SIZE", 3)
+    
+    url_id = db.add_url("https://batches.com")
+    with db.get_cursor() as cursor:
+        cursor.executemany("""
+            INSERT INTO url_checks (url_id, is_up, checked_at)
+            VALUES (?, 1, datetime('now', ?))
+        """, [(url_id, '-60 days')] * 7 + [(url_id, '-1 days')] * 2)
+    
+    assert db.cleanup_old_records(30) == 7
+    with db.get_cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM url_checks")
+        assert cursor.fetchone()[0] == 2
+
+def test_update_url(db: DatabaseManager):
+    """Tests updating URL fields, ignoring ones that are not updatable."""
+    url_id = db.add_url("https://update.com", name="Old", timeout=10)
+    
+    assert db.update_url(url_id, timeout=20, name="New", url="https://other.com") is True
+    record = db.get_url(url_id)
+    assert (record.url, record.name, record.timeout) == ("https://update.com", "New", 20)
+    
+    assert db.update_url(url_id, url="https://other.com") is False
+    assert db.update_url(999, name="Missing") is False
+
+def test_iter_all_status_streams_rows(db: DatabaseManager):
+    """Tests that iter_all_status yields StatusRow tuples and releases its connection."""
+    from app.database import StatusRow
+    for i in range(3):
+        db.add_url(f"https://stream{i}.com")
+    
+    rows = db.iter_all_status()
+    first = next(rows)
+    assert isinstance(first, StatusRow)
+    assert first.url == "https://stream0.com"
+    rows.close()
+    
+    # The pooled connection is back, so the next query doesn't block
+    assert [row.url for row in db.iter_all_status()][1:] == ["https://stream1.com", "https://stream2.com"]
+
+def test_url_lookups_reflect_writes(db: DatabaseManager):
+    """Tests that URL lookups by id and address see updates, new checks and deletes."""
+    url_id = db.add_url("https://lookup.com", name="Before")
+    
+    first = db.get_url(url_id)
+    assert db.get_url_by_address("https://lookup.com") == first
+    assert first.last_checked is None
+    
+    db.update_url(url_id, name="After")
+    assert db.get_url_by_address("https://lookup.com").name == "After"
+    
+    db.save_check_result(url_id, 200, 10.0, True)
+    assert db.get_url(url_id).last_checked is not None
+    
+    db.delete_url(url_id)
+    assert db.get_url(url_id) is None
+
+def test_url_lookups_see_other_connections(tmp_path):
+    """Tests that URL lookups see changes made by another process."""
+    path = str(tmp_path / "shared.db")
+    dashboard, cli = DatabaseManager(path), DatabaseManager(path)
+    url_id = dashboard.add_url("https://shared.com", name="Before")
+    assert dashboard.get_url(url_id).name == "Before"
+    
+    cli.update_url(url_id, name="After")
+    assert dashboard.get_url(url_id).name == "After"
+    
+    cli.delete_url(url_id)
+    assert dashboard.get_url(url_id) is None
+    assert dashboard.get_url_by_address("https://shared.com") is None
+    dashboard.close()
+    cli.close()
+
+def test_add_urls_bulk(db: DatabaseManager):
+    """Tests adding many URLs at once, skipping ones already present."""
+    db.add_url("https://existing.com")
+    
+    added = db.add_urls_bulk(["https://new1.com", "https://existing.com", "https://new2.com"], timeout=5)
+    
+    assert added == 2
+    assert sorted(u.url for u in db.list_urls()) == ["https://existing.com", "https://new1.com", "https://new2.com"]
+    assert db.get_url_by_address("https://new1.com").timeout == 5
+    assert db.add_urls_bulk([]) == 0
@@ -0,0 +1,186 @@
+# FILE: tests/test_main.py
+import json
+import logging
+import re
+import pytest
+import main
+from app.database import DatabaseManager, get_database, reset_database
+
+@pytest.fixture
+def db(monkeypatch):
+    """Fixture to provide an in-memory database and keep the CLI from configuring log files."""
+    monkeypatch.setattr(main, 'setup_logging', lambda background=False: logging.getLogger('main'))
+    db_instance = get_database(db_path=":memory:")
+    yield db_instance
+    reset_database()
+
+def test_add_urls_file_skips_duplicate_lines(db: DatabaseManager, tmp_path, capsys):
+    """Tests that lines repeated in the file are reported apart from URLs already monitored."""
+    db.add_url("https://existing.com")
+    url_file = tmp_path / "urls.txt"
+    url_file.write_text("# monitored sites\nhttps://new.com\n\nhttps://new.com\nhttps://existing.com\n", encoding='utf-8')
+
+    assert main.cmd_add_urls_file(main._parse_args(['--add-urls-file', str(url_file)])) == 0
+
+    assert capsys.readouterr().out == "✓ Added 1 URLs (1 already monitored, 1 duplicate lines skipped)\n"
+    assert sorted(u.url for u in db.list_urls()) == ["https://existing.com", "https://new.com"]
+
+def test_add_urls_file_relative_to_caller(db: DatabaseManager, tmp_path, monkeypatch, capsys):
+    """Tests that a relative URL file is read from the caller's directory, not the project root."""
+    (tmp_path / "urls.txt").write_text("https://relative.com\n", encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main.sys, 'argv', ['main.py', '--add-urls-file', 'urls.txt'])
+
+    assert main.main() == 0
+    assert capsys.readouterr().out == "✓ Added 1 URLs (0 already monitored)\n"
+
+def test_add_urls_file_reports_failed_insert(db: DatabaseManager, tmp_path, capsys):
+    """Tests that a failed bulk insert exits non-zero instead of reporting success."""
+    with db.get_cursor() as cursor:
+        cursor.execute("DROP TABLE urls")
+    url_file = tmp_path / "urls.txt"
+    url_file.write_text("https://new.com\n", encoding='utf-8')
+
+    assert main.cmd_add_urls_file(main._parse_args(['--add-urls-file', str(url_file)])) == 1
+    assert capsys.readouterr().out == "Error: Failed to add URLs to the database\n"
+
+@pytest.fixture
+def populated_db(db: DatabaseManager):
+    """Fixture with an up, an inactive, a down and a never-checked URL, in that order."""
+    alpha = db.add_url("https://alpha.example.com", name="Alpha")
+    beta = db.add_url("https://beta.example.com", active=False)
+    gamma = db.add_url("https://gamma.example.com/health")
+    delta = db.add_url("https://delta.example.com")
+    with db.get_cursor() as cursor:
+        for i, url_id in enumerate((alpha, beta, gamma, delta)):
+            cursor.execute("UPDATE urls SET created_at = ? WHERE id = ?", (f"2024-01-01 00:00:0{i}", url_id))
+    db.save_check_result(alpha, 200, 123.456, True)
+    db.save_check_result(gamma, None, None, False, "Connection error: ConnectionError")
+    return db
+
+# Every supported flag combination plus inputs the fast path hands to argparse
+_ARGVS = [
+    [],
+    ['--init'],
+    ['--init', '--force'],
+    ['--config', 'custom.json', '--status'],
+    ['--add-url', 'https://example.com', '--name', 'Example', '--timeout', '5', '--active'],
+    ['--add-urls-file', 'urls.txt', '--timeout', '30'],
+    ['--list-urls', '--active-only', '--format', 'JSON'],
+    ['--remove-url', '3'],
+    ['--status', '--show-all', '--format', 'TABLE'],
+    ['--status', '--status'],
+    ['--run-check'],
+    ['--schedule'],
+    ['--dashboard', '--schedule'],
+    ['--list-urls', '--status'],
+    # Fallbacks
+    ['--timeout=5', '--add-url', 'https://example.com'],
+    ['--stat'],
+    ['--timeout', '-5', '--add-url', 'https://example.com'],
+    ['--add-url'],
+    ['--add-url', '--name', 'x'],
+    ['--timeout', 'abc'],
+    ['--format', 'XML'],
+    ['--bogus'],
+    ['stray'],
+    ['--help'],
+    ['--version'],
+]
+
+def _parse_outcome(parse, argv):
+    try:
+        return vars(parse(argv))
+    except SystemExit as e:
+        return ('exit', e.code)
+
+@pytest.mark.parametrize("argv", _ARGVS, ids=lambda argv: ' '.join(argv) or '<none>')
+def test_parse_args_matches_argparse(argv, capsys):
+    """Tests that the fast argument parser agrees with the full argparse parser."""
+    assert _parse_outcome(main._parse_args, argv) == _parse_outcome(main._build_parser().parse_args, argv)
+
+def test_actions_dispatch_order(db: DatabaseManager, monkeypatch, capsys):
+    """Tests that actions keep the old if-chain precedence and the first selected one runs."""
+    assert list(main.ACTIONS) == ['init', 'add_url', 'add_urls_file', 'list_urls', 'remove_url',
+                                  'status', 'run_check', 'schedule', 'dashboard']
+    monkeypatch.setattr(main.os, 'chdir', lambda path: None)
+    monkeypatch.setattr(main.sys, 'argv', ['main.py', '--status', '--list-urls'])
+    
+    assert main.main() == 0
+    assert capsys.readouterr().out == "No URLs have been configured yet.\n"
+
+def _status_report(capsys, *argv):
+    assert main.cmd_status(main._parse_args(['--status', *argv])) == 0
+    return re.sub(r"Status Report - \d{4}-\d\d-\d\d \d\d:\d\d:\d\d ---", "Status Report - <now> ---",
+                  capsys.readouterr().out)
+
+def test_status_table_output(populated_db: DatabaseManager, capsys):
+    """Tests that the --status table matches the established report format."""
+    assert _status_report(capsys) == (
+        "\n"
+        "--- Status Report - <now> ---\n"
+        "✓ UP     | https://alpha.example.com                                    |   123.46ms\n"
+        "✗ DOWN   | https://gamma.example.com/health                             | Connection error: Co\n"
+        "? PEND   | https://delta.example.com                                    |      Not checked yet\n"
+        "--------------------------------------------------\n"
+    )
+    assert _status_report(capsys, '--show-all') == (
+        "\n"
+        "--- Status Report - <now> ---\n"
+        "✓ UP     | https://alpha.example.com                                    |   123.46ms\n"
+        "? PEND   | https://beta.example.com                                     |      Not checked yet\n"
+        "✗ DOWN   | https://gamma.example.com/health                             | Connection error: Co\n"
+        "? PEND   | https://delta.example.com                                    |      Not checked yet\n"
+        "--------------------------------------------------\n"
+    )
+
+def test_status_json_output(populated_db: DatabaseManager, capsys):
+    """Tests that --status JSON keeps its fields, their order and their values."""
+    assert main.cmd_status(main._parse_args(['--status', '--format', 'JSON'])) == 0
+    statuses = json.loads(capsys.readouterr().out)
+    
+    assert [list(s) for s in statuses] == [['id', 'url', 'name', 'is_active', 'last_checked', 'status_code',
+                                            'response_time', 'is_up', 'error_message', 'checked_at']] * 4
+    alpha, beta, gamma, delta = statuses
+    assert (alpha['is_active'], alpha['status_code'], alpha['response_time'], alpha['is_up']) == (1, 200, 123.456, 1)
+    assert re.fullmatch(r"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d", alpha['checked_at'])
+    assert alpha['last_checked'] == alpha['checked_at']
+    assert (beta['is_active'], beta['checked_at'], beta['is_up']) == (0, None, None)
+    assert (gamma['is_up'], gamma['error_message']) == (0, "Connection error: ConnectionError")
+    assert delta['last_checked'] is None
+
+def test_list_urls_table_output(populated_db: DatabaseManager, capsys):
+    """Tests that the --list-urls table matches the established format."""
+    assert main.cmd_list_urls(main._parse_args(['--list-urls'])) == 0
+    assert capsys.readouterr().out == (
+        "\n"
+        "--- All Monitored URLs ---\n"
+        "[  1] ✓ Active   | https://alpha.example.com (Alpha)\n"
+        "[  2] ✗ Inactive | https://beta.example.com\n"
+        "[  3] ✓ Active   | https://gamma.example.com/health\n"
+        "[  4] ✓ Active   | https://delta.example.com\n"
+        "--------------------------\n"
+        "Total: 4\n"
+    )
+    assert main.cmd_list_urls(main._parse_args(['--list-urls', '--active-only'])) == 0
+    assert capsys.readouterr().out == (
+        "\n"
+        "--- Active Monitored URLs ---\n"
+        "[  1] ✓ Active   | https://alpha.example.com (Alpha)\n"
+        "[  3] ✓ Active   | https://gamma.example.com/health\n"
+        "[  4] ✓ Active   | https://delta.example.com\n"
+        "--------------------------\n"
+        "Total: 3\n"
+    )
+
+def test_list_urls_json_output(populated_db: DatabaseManager, capsys):
+    """Tests that --list-urls JSON matches the established format."""
+    assert main.cmd_list_urls(main._parse_args(['--list-urls', '--format', 'JSON'])) == 0
+    assert capsys.readouterr().out == (
+        '[\n'
+        '  {\n    "id": 1,\n    "url": "https://alpha.example.com",\n    "name": "Alpha",\n    "active": true,\n    "timeout": 10\n  },\n'
+        '  {\n    "id": 2,\n    "url": "https://beta.example.com",\n    "name": null,\n    "active": false,\n    "timeout": 10\n  },\n'
+        '  {\n    "id": 3,\n    "url": "https://gamma.example.com/health",\n    "name": null,\n    "active": true,\n    "timeout": 10\n  },\n'
+        '  {\n    "id": 4,\n    "url": "https://delta.example.com",\n    "name": null,\n    "active": true,\n    "timeout": 10\n  }\n'
+        ']\n'
+    )
@@ -0,0 +1,20 @@
+# FILE: tests/test_scheduler.py
+import pytest
+from app.scheduler import _parse_schedule
+
+def test_parse_schedule():
+    """Tests that schedule strings are parsed into (hour, minute)."""
+    assert _parse_schedule("06:00") == (6, 0)
+    assert _parse_schedule("20:45") == (20, 45)
+
+def test_parse_schedule_is_cached():
+    """Tests that repeated schedule strings are parsed only once."""
+    _parse_schedule.cache_clear()
+    _parse_schedule("14:00")
+    _parse_schedule("14:00")
+    assert _parse_schedule.cache_info().hits == 1
+
+def test_parse_schedule_rejects_invalid():
+    """Tests that malformed schedule strings raise ValueError."""
+    with pytest.raises(ValueError):
+        _parse_schedule("6am")